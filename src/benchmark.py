@@ -0,0 +1,208 @@
+from corpus import SHAPES, generate_corpus, ordered_list
+from main import PROJECT_DIR, build
+from markdown_to_blocks import BlockType, scan_blocks
+from markdown_to_html import markdown_to_html_node
+from markdown_to_nodes import text_to_nodes
+import argparse, contextlib, io, json, os, random, shutil, subprocess, sys, tempfile, time, tracemalloc
+
+SRC_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def best_time(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def read_pages(content_dir):
+    pages = []
+    for root, _, names in os.walk(content_dir):
+        for name in sorted(names):
+            with open(os.path.join(root, name), 'r', encoding='utf-8') as f:
+                pages.append(f.read())
+    return pages
+
+
+def inline_texts(pages):
+    """The paragraph and heading text of every page, as fed to text_to_nodes."""
+    texts = []
+    for page in pages:
+        for block in scan_blocks(page):
+            if block.block_type in (BlockType.PARAGRAPH, BlockType.HEADING):
+                texts.append(" ".join(line.strip() for line in block.lines).lstrip("# "))
+    return texts
+
+
+def run_benchmarks(pages=200, shape="mixed", repeat=3, seed=0, list_items=10_000):
+    """Generate a corpus and time each stage of the pipeline over it, plus
+    parsing a single ordered list of `list_items` items.
+
+    Returns {benchmark: {"seconds", "pages_per_second", "mb_per_second"}}
+    using the best of `repeat` runs.
+    """
+    results = {}
+    with tempfile.TemporaryDirectory() as project_dir:
+        content_dir = os.path.join(project_dir, "content")
+        total_bytes = generate_corpus(content_dir, pages, shape, seed)
+        shutil.copy(os.path.join(PROJECT_DIR, "template.html"), project_dir)
+        sources = read_pages(content_dir)
+        texts = inline_texts(sources)
+        nodes = [markdown_to_html_node(source) for source in sources]
+        inline_bytes = sum(len(text.encode('utf-8')) for text in texts)
+
+        def record(name, seconds, size, page_count=len(sources)):
+            results[name] = {
+                "seconds": seconds,
+                "pages_per_second": page_count / seconds if seconds else 0.0,
+                "mb_per_second": size / seconds / 1e6 if seconds else 0.0,
+            }
+
+        record("text_to_nodes", best_time(lambda: [text_to_nodes(text) for text in texts], repeat), inline_bytes)
+        record("markdown_to_html_node",
+               best_time(lambda: [markdown_to_html_node(source) for source in sources], repeat), total_bytes)
+        record("to_html", best_time(lambda: [node.to_html() for node in nodes], repeat), total_bytes)
+
+        long_list = ordered_list(random.Random(seed), list_items)
+        record("ordered_list", best_time(lambda: markdown_to_html_node(long_list), repeat),
+               len(long_list.encode('utf-8')), page_count=1)
+
+        public_dir = os.path.join(project_dir, "docs")
+        manifest_path = os.path.join(project_dir, "cache", "manifest.json")
+
+        def full_build():
+            with contextlib.redirect_stdout(io.StringIO()):
+                build(project_dir, public_dir, manifest_path=manifest_path)
+
+        record("build", best_time(full_build, repeat), total_bytes)
+    return results
+
+
+def measure_tree_memory(pages=50, shape="mixed", seed=0):
+    """Average bytes one page's node tree keeps alive, and the peak allocated
+    while building it, measured with tracemalloc."""
+    with tempfile.TemporaryDirectory() as content_dir:
+        generate_corpus(content_dir, pages, shape, seed)
+        sources = read_pages(content_dir)
+
+    retained = peak = 0
+    tracemalloc.start()
+    try:
+        for source in sources:
+            tracemalloc.reset_peak()
+            start, _ = tracemalloc.get_traced_memory()
+            node = markdown_to_html_node(source)
+            current, page_peak = tracemalloc.get_traced_memory()
+            retained += current - start
+            peak += page_peak - start
+            del node
+    finally:
+        tracemalloc.stop()
+    return {
+        "retained_bytes_per_page": retained / len(sources),
+        "peak_bytes_per_page": peak / len(sources),
+    }
+
+
+def import_times(code="import main"):
+    """Run `code` in a fresh interpreter under -X importtime and return
+    {module: cumulative microseconds} for everything it imported."""
+    completed = subprocess.run([sys.executable, "-X", "importtime", "-c", code], cwd=SRC_DIR,
+                               capture_output=True, text=True, check=True)
+    times = {}
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+def measure_startup(repeat=3):
+    """Best-of-`repeat` cost of importing the CLI, and the slowest imports."""
+    best = None
+    for _ in range(repeat):
+        times = import_times()
+        if best is None or times["main"] < best["main"]:
+            best = times
+    return {
+        "import_main_ms": best["main"] / 1000,
+        "modules": len(best),
+        "slowest": sorted(best.items(), key=lambda item: item[1], reverse=True)[1:6],
+    }
+
+
+def print_startup(startup, baseline=None):
+    line = f"{'import main':<24}{startup['import_main_ms']:>12.2f} ms  ({startup['modules']} modules)"
+    if baseline and baseline.get("import_main_ms"):
+        line += f"{baseline['import_main_ms'] / startup['import_main_ms']:>10.2f}x"
+    print(line)
+    for name, microseconds in startup["slowest"]:
+        print(f"  {name.strip():<22}{microseconds / 1000:>12.2f} ms")
+
+
+def print_memory(memory, baseline=None):
+    for name, value in memory.items():
+        line = f"{name:<24}{value / 1024:>12.1f} KiB"
+        if baseline and baseline.get(name):
+            line += f"{value / baseline[name]:>14.2f}x"
+        print(line)
+
+
+def print_results(results, baseline=None):
+    print(f"{'benchmark':<24}{'seconds':>12}{'pages/s':>12}{'MB/s':>10}{'vs baseline':>14}")
+    for name, result in results.items():
+        line = f"{name:<24}{result['seconds']:>12.4f}{result['pages_per_second']:>12.1f}{result['mb_per_second']:>10.2f}"
+        if baseline and name in baseline:
+            speedup = baseline[name]["seconds"] / result["seconds"] if result["seconds"] else 0.0
+            line += f"{speedup:>13.2f}x"
+        print(line)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the generator on a synthetic corpus")
+    parser.add_argument("--pages", type=int, default=200)
+    parser.add_argument("--shape", choices=SHAPES, default="mixed")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--list-items", type=int, default=10_000,
+                        help="items in the ordered list micro-benchmark")
+    parser.add_argument("--memory", action="store_true",
+                        help="also measure node tree memory per page")
+    parser.add_argument("--startup", action="store_true",
+                        help="also measure CLI import time with -X importtime")
+    parser.add_argument("--save", metavar="FILE", help="write the results as a JSON baseline")
+    parser.add_argument("--compare", metavar="FILE", help="compare against a saved baseline")
+    args = parser.parse_args(argv)
+
+    baseline = {}
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+
+    results = run_benchmarks(args.pages, args.shape, args.repeat, args.seed, args.list_items)
+    print(f"Corpus: {args.pages} {args.shape} pages (seed {args.seed}), best of {args.repeat}")
+    print_results(results, baseline.get("results"))
+
+    memory = None
+    if args.memory:
+        memory = measure_tree_memory(args.pages, args.shape, args.seed)
+        print_memory(memory, baseline.get("memory"))
+
+    startup = None
+    if args.startup:
+        startup = measure_startup(args.repeat)
+        print_startup(startup, baseline.get("startup"))
+
+    if args.save:
+        with open(args.save, 'w', encoding='utf-8') as f:
+            json.dump({"pages": args.pages, "shape": args.shape, "seed": args.seed,
+                       "results": results, "memory": memory,
+                       "startup": startup}, f, indent=2)
+        print(f"Saved baseline to {args.save}")
+
+
+if __name__ == "__main__":
+    main()
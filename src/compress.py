@@ -0,0 +1,98 @@
+from concurrent.futures import ThreadPoolExecutor
+import gzip, os, shutil, threading
+
+# zlib releases the GIL while compressing, so threads compress in parallel.
+COMPRESS_WORKERS = 4
+COMPRESS_LEVEL = 9
+# Images, fonts and archives are already compressed; gzipping them again
+# only costs time and disk.
+COMPRESSIBLE_EXTENSIONS = {".html", ".htm", ".css", ".js", ".mjs", ".json", ".map", ".svg", ".xml", ".txt", ".md"}
+SUFFIX = ".gz"
+
+
+def compressed_path(path):
+    return path + SUFFIX
+
+
+def is_compressible(path):
+    return os.path.splitext(path)[1].lower() in COMPRESSIBLE_EXTENSIONS
+
+
+def compress_file(path, level=COMPRESS_LEVEL):
+    """Write a gzip sibling of `path` next to it, atomically and with the
+    source's mtime. The gzip header's own timestamp is zeroed so the same
+    content always compresses to the same bytes."""
+    dest_path = compressed_path(path)
+    tmp_path = f"{dest_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(path, 'rb') as src, open(tmp_path, 'wb') as raw:
+            with gzip.GzipFile(filename="", mode='wb', fileobj=raw, compresslevel=level, mtime=0) as dest:
+                shutil.copyfileobj(src, dest)
+        shutil.copystat(path, tmp_path)
+        os.replace(tmp_path, dest_path)
+    finally:
+        if os.path.lexists(tmp_path):
+            os.remove(tmp_path)
+
+
+def is_current(path):
+    """True when the `.gz` sibling of `path` was compressed from its present
+    content. compress_file gives the sibling the source's mtime, so any
+    rewrite since, such as by a build without compression, shows as a
+    mismatch."""
+    try:
+        return os.stat(compressed_path(path)).st_mtime_ns == os.stat(path).st_mtime_ns
+    except OSError:
+        return False
+
+
+class Compressor:
+    """Writes precompressed `.gz` siblings of outputs on a thread pool.
+
+    Callers submit every output they touch and say whether its content
+    changed; an unchanged file is only compressed when its sibling is
+    missing or stale (see is_current), so a build recompresses just what
+    was rewritten since its sibling was made. `close` waits for the pool
+    and raises the first failure.
+    """
+
+    def __init__(self, workers=COMPRESS_WORKERS, level=COMPRESS_LEVEL):
+        self.pool = ThreadPoolExecutor(max_workers=workers)
+        self.level = level
+        self.futures = []
+        self.compressed = 0
+        self.skipped = 0
+        self.lock = threading.Lock()
+
+    def submit(self, path, changed=True):
+        if not is_compressible(path):
+            return
+        if not changed and is_current(path):
+            with self.lock:
+                self.skipped += 1
+            return
+        future = self.pool.submit(compress_file, path, self.level)
+        with self.lock:
+            self.futures.append(future)
+            self.compressed += 1
+
+    def close(self):
+        self.pool.shutdown(wait=True)
+        for future in self.futures:
+            future.result()
+        self.futures = []
+
+    def merge(self, compressed, skipped):
+        with self.lock:
+            self.compressed += compressed
+            self.skipped += skipped
+
+    def stats(self):
+        return f"Compression: {self.compressed} files gzipped, {self.skipped} unchanged"
+
+
+def remove_compressed(path):
+    """Remove the `.gz` sibling of an output being deleted, if there is one."""
+    sibling = compressed_path(path)
+    if os.path.isfile(sibling):
+        os.remove(sibling)
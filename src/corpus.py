@@ -0,0 +1,112 @@
+import os, random
+
+WORDS = (
+    "the ring hobbit shire elf dwarf wizard road river mountain forest tower "
+    "king sword song light shadow journey fellowship council gate stone"
+).split()
+
+SHAPES = ("small", "huge", "links", "nested", "mixed")
+
+
+def sentence(rng, words=12):
+    """A line of plain words with the occasional bold, italic or code span."""
+    parts = []
+    for _ in range(words):
+        word = rng.choice(WORDS)
+        roll = rng.random()
+        if roll < 0.05:
+            word = f"**{word}**"
+        elif roll < 0.10:
+            word = f"_{word}_"
+        elif roll < 0.13:
+            word = f"`{word}`"
+        parts.append(word)
+    return " ".join(parts)
+
+
+def link_sentence(rng, links=8):
+    parts = []
+    for i in range(links):
+        target = rng.choice(WORDS)
+        if rng.random() < 0.2:
+            parts.append(f"![{target} picture](/images/{target}.png)")
+        else:
+            parts.append(f"[{target} {i}](/blog/{target}/{i})")
+        parts.append(sentence(rng, 3))
+    return " ".join(parts)
+
+
+def paragraph(rng, lines=3):
+    return "\n".join(sentence(rng) for _ in range(lines))
+
+
+def unordered_list(rng, items):
+    return "\n".join(f"- {sentence(rng, 6)}" for _ in range(items))
+
+
+def ordered_list(rng, items):
+    return "\n".join(f"{i}. {sentence(rng, 6)}" for i in range(1, items + 1))
+
+
+def quote(rng, depth, lines):
+    return "\n".join(">" * rng.randint(1, depth) + " " + sentence(rng, 8) for _ in range(lines))
+
+
+def code_block(rng, lines):
+    body = "\n".join(f"    {rng.choice(WORDS)}_{i} = {i} ** 2" for i in range(lines))
+    return f"```\n{body}\n```"
+
+
+def make_page(rng, shape, index):
+    blocks = [f"# {shape.title()} page {index}"]
+    if shape == "small":
+        blocks += [paragraph(rng) for _ in range(rng.randint(2, 5))]
+        blocks.append(unordered_list(rng, 4))
+    elif shape == "huge":
+        for section in range(200):
+            blocks.append(f"## Section {section}")
+            blocks.append(paragraph(rng, 5))
+            blocks.append(ordered_list(rng, 10))
+            blocks.append(code_block(rng, 8))
+    elif shape == "links":
+        blocks += [link_sentence(rng, 40) for _ in range(20)]
+    elif shape == "nested":
+        for _ in range(20):
+            blocks.append(quote(rng, 6, 30))
+            blocks.append(unordered_list(rng, 50))
+            blocks.append(ordered_list(rng, 50))
+    else:
+        raise ValueError(f"Unknown corpus shape: {shape}")
+    return "\n\n".join(blocks) + "\n"
+
+
+def page_shape(shape, index):
+    """The shape for the index-th page; "mixed" is mostly small posts with a
+    sprinkling of the heavier shapes."""
+    if shape != "mixed":
+        return shape
+    if index % 100 == 99:
+        return "huge"
+    if index % 10 == 7:
+        return "links"
+    if index % 10 == 3:
+        return "nested"
+    return "small"
+
+
+def generate_corpus(content_dir, pages=100, shape="mixed", seed=0):
+    """Write `pages` synthetic markdown pages under `content_dir` and return
+    the total number of bytes written."""
+    rng = random.Random(seed)
+    total = 0
+    for index in range(pages):
+        page = make_page(rng, page_shape(shape, index), index)
+        if index == 0:
+            path = os.path.join(content_dir, "index.md")
+        else:
+            path = os.path.join(content_dir, "blog", f"post{index // 1000}", f"{index}", "index.md")
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(page)
+        total += len(page.encode('utf-8'))
+    return total
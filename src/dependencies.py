@@ -0,0 +1,91 @@
+import os, posixpath
+
+# Every page depends on these besides its own source and links.
+SHARED_DEPENDENCIES = ("template.html", "basepath")
+
+
+def local_target(url, page_dir="/"):
+    """The site path a link or image URL points at, or None when it leaves
+    the site. Relative URLs are resolved against `page_dir`, the URL of the
+    directory holding the page; queries and fragments are dropped and
+    percent-escapes decoded, so the result compares equal to file paths."""
+    if not url or url.startswith(("#", "//")) or ":" in url.split("/", 1)[0]:
+        return None
+    path = url.split("#", 1)[0].split("?", 1)[0]
+    if not path:
+        return None
+    if "%" in path:
+        from urllib.parse import unquote
+        path = unquote(path)
+    if not path.startswith("/"):
+        path = posixpath.join(page_dir, path)
+    return posixpath.normpath(path)
+
+
+def block_urls(text):
+    """Every link and image URL in a block of markdown text."""
+    from markdown_to_nodes import extract_markdown_images, extract_markdown_links
+
+    if "](" not in text:
+        return []
+    return [url for _, url in extract_markdown_images(text) + extract_markdown_links(text)]
+
+
+def page_links(urls, output):
+    """The sorted local targets of `urls` for the page written to `output`,
+    a path relative to the output directory."""
+    page_dir = "/" + posixpath.dirname(output.replace(os.sep, "/"))
+    return sorted({target for target in (local_target(url, page_dir) for url in urls) if target})
+
+
+class DependencyGraph:
+    """Which pages depend on which inputs, built from manifest page entries.
+
+    Besides its source, the shared template and the basepath, a page depends
+    on every local path its links and images point at, which is how it
+    depends on static assets. The reverse index finds the pages a changed
+    asset invalidates without scanning every entry.
+    """
+
+    def __init__(self, entries):
+        self.entries = entries
+        self.dependents_of = {}
+        for source_key, entry in entries.items():
+            for link in entry.get("links", ()):
+                self.dependents_of.setdefault(link, []).append(source_key)
+
+    def dependents(self, target):
+        return self.dependents_of.get(target, [])
+
+    def dependencies(self, source_key):
+        return [source_key, *SHARED_DEPENDENCIES, *self.entries[source_key].get("links", ())]
+
+
+def explain_lines(query, entries, reasons):
+    """Lines saying why pages were rebuilt and what they depend on.
+
+    With an empty `query` every rebuilt page is listed; otherwise the pages
+    whose source (relative to content/, or any path ending in it) or output
+    path matches `query`, rebuilt or not.
+    """
+    graph = DependencyGraph(entries)
+    query = os.path.normpath(query) if query else ""
+
+    def matches(source_key, entry):
+        if not query:
+            return source_key in reasons
+        return any(query == path or query.endswith(os.sep + path) for path in (source_key, entry["output"]))
+
+    keys = [source_key for source_key, entry in sorted(entries.items()) if matches(source_key, entry)]
+    if not keys:
+        return [f"No page matches {query}" if query else "No pages were rebuilt"]
+
+    lines = []
+    for source_key in keys:
+        lines.append(f"{source_key} -> {entries[source_key]['output']}")
+        if source_key in reasons:
+            lines.append(f"  rebuilt: {reasons[source_key]}")
+        else:
+            lines.append("  up to date")
+        lines.append(f"  depends on: {', '.join(graph.dependencies(source_key))}")
+    return lines
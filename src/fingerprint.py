@@ -0,0 +1,100 @@
+from jsonfile import load_json, save_json_atomic
+from manifest import hash_file
+import hashlib, json, os
+
+ASSETS_VERSION = 1
+FINGERPRINT_LENGTH = 8
+# Assets that are referenced from pages and safe to cache forever under a
+# hashed name. Pages, favicons, robots.txt and the like keep fixed names.
+FINGERPRINT_EXTENSIONS = {
+    ".css", ".js", ".mjs", ".png", ".jpg", ".jpeg", ".gif", ".webp", ".avif", ".svg",
+    ".woff", ".woff2", ".ttf", ".otf", ".mp4", ".webm",
+}
+
+
+def is_fingerprintable(relative_path):
+    return os.path.splitext(relative_path)[1].lower() in FINGERPRINT_EXTENSIONS
+
+
+def fingerprinted_path(relative_path, digest):
+    """"index.css" with content hash "3fa9c1d2..." becomes "index.3fa9c1d2.css"."""
+    root, ext = os.path.splitext(relative_path)
+    return f"{root}.{digest[:FINGERPRINT_LENGTH]}{ext}"
+
+
+def site_path(relative_path):
+    return "/" + relative_path.replace(os.sep, "/")
+
+
+class AssetManifest:
+    """Fingerprinted names of static assets, saved to .ssg-cache/assets.json.
+
+    Each asset is recorded with its content hash and the size and mtime it
+    was hashed at, so an unchanged asset is never read again to rename it.
+    """
+
+    def __init__(self, path=None, assets=None):
+        self.path = path
+        self.assets = assets or {}
+        self.hashed = 0
+
+    @classmethod
+    def load(cls, path):
+        data = load_json(path, ASSETS_VERSION)
+        if data is None:
+            return cls(path)
+        return cls(path, data.get("assets", {}))
+
+    def save(self):
+        if not self.path:
+            return
+        save_json_atomic(self.path, {"version": ASSETS_VERSION, "assets": self.assets}, indent=2)
+
+    def update(self, static_dir, files):
+        """Fingerprint the assets among `files`, paths relative to
+        `static_dir`, and forget ones that are gone. Returns
+        {relative_path: fingerprinted relative path}."""
+        assets = {}
+        for relative_path in files:
+            if not is_fingerprintable(relative_path):
+                continue
+            stat = os.stat(os.path.join(static_dir, relative_path))
+            entry = self.assets.get(relative_path)
+            if not entry or entry["size"] != stat.st_size or entry["mtime_ns"] != stat.st_mtime_ns:
+                digest = hash_file(os.path.join(static_dir, relative_path))
+                self.hashed += 1
+                entry = {
+                    "hash": digest,
+                    "size": stat.st_size,
+                    "mtime_ns": stat.st_mtime_ns,
+                    "output": fingerprinted_path(relative_path, digest),
+                }
+            assets[relative_path] = entry
+        self.assets = assets
+        return {relative_path: entry["output"] for relative_path, entry in assets.items()}
+
+    def urls(self):
+        """Sorted (url, fingerprinted url) pairs, hashable so resolvers and
+        compiled templates built from them can be cached."""
+        return tuple(sorted((site_path(relative_path), site_path(entry["output"]))
+                            for relative_path, entry in self.assets.items()))
+
+    def template_assets(self, template_path):
+        """Sorted (url, fingerprinted url) pairs of the assets the template
+        at `template_path` references."""
+        from template import URL_ATTRIBUTE_PATTERN
+
+        urls = dict(self.urls())
+        with open(template_path, 'r', encoding='utf-8') as f:
+            return sorted({(url, urls[url]) for _, url in URL_ATTRIBUTE_PATTERN.findall(f.read()) if url in urls})
+
+    def template_key(self, template_hash, template_assets):
+        """`template_hash` extended with the fingerprints of
+        `template_assets`, since a page embeds them as much as its own links.
+        Any key made here differs from a plain template hash, so turning
+        fingerprinting on or off re-renders every page."""
+        digest = hashlib.sha256(json.dumps(template_assets).encode('utf-8')).hexdigest()
+        return f"{template_hash}+assets:{digest}"
+
+    def stats(self):
+        return f"Assets: {len(self.assets)} fingerprinted, {self.hashed} hashed"
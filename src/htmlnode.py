@@ -1,12 +1,41 @@
+from types import MappingProxyType
+
+
+class _EmptyChildren(list):
+    """The read-only empty list shared by every node without children."""
+
+    __slots__ = ()
+
+    def _read_only(self, *args, **kwargs):
+        raise TypeError("shared empty children list is read-only; pass a list of children instead")
+
+    append = extend = insert = remove = pop = clear = sort = reverse = _read_only
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _read_only
+
+
+# Leaves never have children and most nodes have no props, so they all share
+# these empties instead of allocating a fresh list and dict each.
+EMPTY_CHILDREN = _EmptyChildren()
+EMPTY_PROPS = MappingProxyType({})
+
+
 class HTMLNode:
+    __slots__ = ("tag", "value", "children", "props")
+
     def __init__(self, tag=None, value=None, children=None, props=None):
         self.tag = tag
         self.value = value
-        self.children = children if children else []
-        self.props = props if props else {}
+        self.children = children if children else EMPTY_CHILDREN
+        self.props = props if props else EMPTY_PROPS
     
     def to_html(self):
         raise NotImplementedError
+
+    def iter_html(self):
+        yield self.to_html()
+
+    def write_to(self, fp):
+        fp.writelines(self.iter_html())
     
     def props_to_html(self):
         if not self.props:
@@ -22,8 +51,13 @@ class HTMLNode:
         )
     
 class LeafNode(HTMLNode):
+    __slots__ = ()
+
     def __init__(self, tag, value, props=None):
-        super().__init__(tag=tag, value=value, children=None, props=props)
+        self.tag = tag
+        self.value = value
+        self.children = EMPTY_CHILDREN
+        self.props = props if props else EMPTY_PROPS
     
     def to_html(self):
         if self.value is None:
@@ -35,16 +69,26 @@ class LeafNode(HTMLNode):
         return f"<{self.tag}{self.props_to_html()}>{self.value}</{self.tag}>"
     
 class ParentNode(HTMLNode):
+    __slots__ = ()
+
     def __init__(self, tag, children, props=None):
-        super().__init__(tag=tag, value=None, children=children, props=props)
+        self.tag = tag
+        self.value = None
+        self.children = children if children else EMPTY_CHILDREN
+        self.props = props if props else EMPTY_PROPS
 
     def to_html(self):
+        return "".join(self.iter_html())
+
+    def iter_html(self):
         if self.tag is None:
             raise ValueError("Missing tag")
         
         if not self.children:
             raise ValueError("Missing Children")
         
-        children_html = "".join(child.to_html() for child in self.children)
-        return f"<{self.tag}{self.props_to_html()}>{children_html}</{self.tag}>"
+        yield f"<{self.tag}{self.props_to_html()}>"
+        for child in self.children:
+            yield from child.iter_html()
+        yield f"</{self.tag}>"
     
\ No newline at end of file
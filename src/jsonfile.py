@@ -0,0 +1,26 @@
+import json, os
+
+
+def load_json(path, version):
+    """The JSON object saved at `path`, or None when it is missing,
+    unreadable or saved with a format version other than `version`."""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(data, dict) or data.get("version") != version:
+        return None
+    return data
+
+
+def save_json_atomic(path, data, indent=None):
+    """Write `data` as JSON to `path` through a temporary file, so an
+    interrupted build leaves the previous file rather than half a new one."""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=indent, sort_keys=True)
+    os.replace(tmp_path, path)
@@ -0,0 +1,81 @@
+import os, posixpath
+
+# Pages listed in a broken link report before the rest are summarized.
+REPORT_PAGE_LIMIT = 20
+
+
+class BrokenLinksError(Exception):
+    def __init__(self, broken):
+        self.broken = broken
+        link_count = sum(len(targets) for _, targets in broken)
+        super().__init__(f"{link_count} broken link(s) in {len(broken)} page(s)")
+
+
+def served_paths(relative_path):
+    """The site paths that serve the output file at `relative_path`: the
+    file itself, plus its directory for an index.html and the extensionless
+    path for any other page."""
+    path = "/" + relative_path.replace(os.sep, "/")
+    yield path
+    directory, name = posixpath.split(path)
+    if name == "index.html":
+        yield directory
+    elif name.endswith(".html"):
+        yield path[:-len(".html")]
+
+
+class SiteIndex:
+    """Every site path the build serves, from the page outputs it planned and
+    the static files it synced, so checking a link is one set lookup and the
+    output directory is never crawled."""
+
+    def __init__(self, outputs, static_files=()):
+        self.paths = set()
+        for relative_path in (*outputs, *static_files):
+            self.paths.update(served_paths(relative_path))
+
+    def __contains__(self, target):
+        return target in self.paths
+
+    def __len__(self):
+        return len(self.paths)
+
+
+def find_broken_links(entries, index):
+    """(source_key, [target, ...]) for each page in manifest `entries` whose
+    recorded links miss `index`, sorted by source."""
+    broken = []
+    for source_key, entry in sorted(entries.items()):
+        targets = [target for target in entry.get("links", ()) if target not in index]
+        if targets:
+            broken.append((source_key, targets))
+    return broken
+
+
+def report_lines(broken, limit=REPORT_PAGE_LIMIT):
+    link_count = sum(len(targets) for _, targets in broken)
+    lines = [f"Broken links: {link_count} in {len(broken)} pages"]
+    for source_key, targets in broken[:limit]:
+        lines.append(f"  {source_key}: {', '.join(targets)}")
+    if len(broken) > limit:
+        lines.append(f"  ... and {len(broken) - limit} more pages")
+    return lines
+
+
+def check_links(entries, static_files, fail=False, outputs=None):
+    """Check every page's links against the site and print a report of the
+    broken ones. With `fail`, broken links raise a BrokenLinksError. The
+    site's pages are the outputs of `entries` unless `outputs` lists them,
+    as when a shard checks the pages it rendered against the whole site."""
+    if outputs is None:
+        outputs = [entry["output"] for entry in entries.values()]
+    index = SiteIndex(outputs, static_files)
+    broken = find_broken_links(entries, index)
+    if not broken:
+        print(f"Links: all resolve against {len(index)} site paths")
+        return broken
+    for line in report_lines(broken):
+        print(line)
+    if fail:
+        raise BrokenLinksError(broken)
+    return broken
@@ -1,138 +1,448 @@
-from markdown_to_html import markdown_to_html_node
-import os, shutil, re,sys 
+# The parser, templates and worker pool are imported where a page is first
+# rendered, so a build with nothing to do never pays to load them.
+from dependencies import explain_lines, page_links
+from manifest import Manifest, hash_file
+from static_sync import sync_static
+import contextlib, hashlib, os, sys
+
+PROJECT_DIR = os.path.dirname(os.path.abspath(__file__)).replace("/src", '')
+CACHE_DIR = ".ssg-cache"
 
 def main():
-    basepath = "/"
-    if len(sys.argv) == 2:
-        basepath = sys.argv[1]
+    if sys.argv[1:2] == ["serve"]:
+        import server
+        server.main(sys.argv[2:])
+        return
+    if sys.argv[1:2] == ["merge"]:
+        import shard
+        shard.main(sys.argv[2:])
+        return
+
+    import argparse
+    parser = argparse.ArgumentParser(description="Build the static site into docs/")
+    parser.add_argument("basepath", nargs="?", default="/")
+    parser.add_argument("--output", default=os.path.join(PROJECT_DIR, "docs"),
+                        help="directory to build into (default docs/)")
+    parser.add_argument("--shard", metavar="I/N",
+                        help="render only shard I of N of the pages, split by a stable hash of their paths; "
+                             "combine the shards' outputs with `main.py merge`")
+    parser.add_argument("--incremental", action="store_true",
+                        help="only re-render pages whose inputs changed since the last build")
+    parser.add_argument("-j", "--jobs", type=int, default=1,
+                        help="render pages across N worker processes (0 uses every core)")
+    parser.add_argument("--queue-depth", type=int, default=0, metavar="N",
+                        help="overlap reading, rendering and writing pages in threaded stages "
+                             "that queue up to N pages each")
+    parser.add_argument("--link-static", action="store_true",
+                        help="hardlink static files into the output instead of copying them")
+    parser.add_argument("--checksum-static", action="store_true",
+                        help="compare static files by content hash instead of size and mtime")
+    parser.add_argument("--fingerprint", action="store_true",
+                        help="also write static assets under content-hashed names (index.3fa9c1d2.css) "
+                             "and link pages to those")
+    parser.add_argument("--gzip", action="store_true",
+                        help="also write precompressed .gz siblings of pages and text assets")
+    parser.add_argument("--block-cache", action="store_true",
+                        help="reuse rendered HTML for blocks seen before, kept in .ssg-cache/blocks.json")
+    parser.add_argument("--profile", metavar="REPORT",
+                        help="time each rendering phase per page and write a JSON (or .csv) report")
+    parser.add_argument("--check-links", nargs="?", const="warn", choices=["warn", "error"],
+                        help="report links and images that point at no page or static file; "
+                             "with 'error' they fail the build")
+    parser.add_argument("--explain", nargs="?", const="", metavar="PAGE",
+                        help="say why each page was re-rendered, or whether PAGE was and what it depends on")
+    args = parser.parse_args()
+
+    from link_check import BrokenLinksError
+
+    shard = None
+    if args.shard:
+        from shard import parse_shard
+        try:
+            shard = parse_shard(args.shard)
+        except ValueError as e:
+            parser.error(str(e))
+
+    try:
+        build(PROJECT_DIR, args.output, args.basepath, incremental=args.incremental, jobs=args.jobs,
+              link_static=args.link_static, checksum_static=args.checksum_static, profile_path=args.profile,
+              block_cache=args.block_cache, queue_depth=args.queue_depth, explain=args.explain,
+              check_links=args.check_links, compress=args.gzip, fingerprint=args.fingerprint, shard=shard)
+    except BrokenLinksError as e:
+        sys.exit(f"Build failed: {e}")
 
-    project_dir = os.path.dirname(os.path.abspath(__file__)).replace("/src", '')
-    public_dir = os.path.join(project_dir, "docs")
-    convert(project_dir, public_dir)
 
+def build(project_dir, public_dir, basepath="/", incremental=False, manifest_path=None, jobs=1,
+          link_static=False, checksum_static=False, profile_path=None, block_cache=False, queue_depth=0,
+          explain=None, check_links=None, compress=False, fingerprint=False, shard=None):
     content_path = os.path.join(project_dir, "content")
+    static_dir = os.path.join(project_dir, "static")
     template_path = os.path.join(project_dir, "template.html")
+    default_root = os.path.abspath(public_dir) == os.path.abspath(os.path.join(project_dir, "docs"))
+    if manifest_path is None:
+        manifest_path = os.path.join(project_dir, CACHE_DIR, cache_key(public_dir, default_root, shard),
+                                     "manifest.json")
 
-    
-    for item in os.listdir(content_path):
-        item_path = os.path.join(content_path, item)
-        
-        
-        if os.path.isfile(item_path):
-            if item.endswith('.md'):
-                output_filename = item.replace('.md', '.html')
-                output_path = os.path.join(public_dir, output_filename)
-            else:
-                output_path = os.path.join(public_dir, item)
+    manifest = Manifest.load_for(manifest_path, public_dir)
+    pages = find_pages(content_path, public_dir)
+    # Links are checked against every page of the site, not just this shard's.
+    site_outputs = [os.path.relpath(dest_path, public_dir) for _, dest_path in pages]
+    if shard:
+        from shard import select_shard
+        pages = select_shard(pages, content_path, *shard)
+        print(f"Shard {shard[0]}/{shard[1]}: rendering {len(pages)} of {len(site_outputs)} pages")
+    template_hash = hash_file(template_path)
+
+    from output import claim_output_root, list_outputs
+
+    owned = claim_output_root(public_dir, shard, known_root=default_root)
+    os.makedirs(public_dir, exist_ok=True)
+    # The generator owns the output root, so anything a build from scratch
+    # does not produce is stale. The root is listed before static files are
+    # synced, while the compressor has no temporary files in it yet.
+    prune_all = owned and (not incremental or manifest.template_hash is None)
+    existing_outputs = list_outputs(public_dir) if prune_all else []
+    compressor = None
+    if compress:
+        from compress import Compressor
+        compressor = Compressor()
+    assets = None
+    if fingerprint:
+        from fingerprint import AssetManifest
+        assets = AssetManifest.load(os.path.join(os.path.dirname(manifest_path), "assets.json"))
+    static_files, copied = sync_static(static_dir, public_dir, link=link_static, checksum=checksum_static,
+                                       compressor=compressor, assets=assets)
+    asset_urls = ()
+    template_assets = ()
+    if assets:
+        asset_urls = assets.urls()
+        used = assets.template_assets(template_path)
+        template_hash = assets.template_key(template_hash, used)
+        template_assets = {url for url, _ in used}
+        print(assets.stats())
+        assets.save()
+    static_outputs = {os.path.join(public_dir, relative_path) for relative_path in static_files}
+    changed_static = set(copied) | (set(manifest.static) - set(static_files))
+    changed_assets = {"/" + relative_path.replace(os.sep, "/") for relative_path in changed_static}
+
+    to_render, to_delete, entries, reasons = manifest.plan(pages, content_path, public_dir, template_hash,
+                                                           basepath, force=not incremental,
+                                                           changed_assets=changed_assets,
+                                                           template_assets=template_assets)
+    expected = {dest_path for _, dest_path in pages} | static_outputs
+    if compressor:
+        from compress import compressed_path, is_compressible
+        expected |= {compressed_path(output_path) for output_path in expected if is_compressible(output_path)}
+    if prune_all:
+        to_delete = [os.path.join(public_dir, relative_path) for relative_path in existing_outputs]
+    else:
+        # Only what an earlier build recorded writing may be removed.
+        to_delete += [os.path.join(public_dir, relative_path) for relative_path in manifest.static]
+        if not owned:
+            print(f"Not pruning unknown files in {public_dir}: it was not created by this generator")
+    to_delete = sorted({output_path for output_path in to_delete if output_path not in expected})
+
+    if to_delete:
+        from compress import remove_compressed
+    for output_path in to_delete:
+        if os.path.isfile(output_path):
+            print(f"Removing stale output {output_path}")
+            os.remove(output_path)
+            remove_compressed(output_path)
+            remove_empty_dirs(os.path.dirname(output_path), public_dir)
+
+    if compressor:
+        # Pages left alone this build still get a sibling if they lack one.
+        rendering = {dest_path for _, dest_path in to_render}
+        for _, dest_path in pages:
+            if dest_path not in rendering:
+                compressor.submit(dest_path, changed=False)
+
+    if not to_render and not to_delete and not profile_path and manifest.matches(
+            template_hash, basepath, entries, static_files):
+        if compressor:
+            finish_compression(compressor)
+        print(f"Rendered 0 of {len(pages)} pages, nothing changed")
+        if explain is not None:
+            print_explanation(explain, entries, reasons)
+        if check_links:
+            run_link_check(entries, site_outputs, static_files, check_links)
+        return
+
+    from output import OutputWriter
+
+    writer = OutputWriter(compressor)
+    page_urls = {}
+    profile = cache = None
+    if profile_path:
+        from profiling import BuildProfile, PageTimer
+        profile = BuildProfile()
+    if block_cache:
+        from render_cache import BlockCache
+        cache = BlockCache.load(os.path.join(os.path.dirname(manifest_path), "blocks.json"))
+    if jobs != 1 and len(to_render) > 1:
+        from parallel import render_pages
+        _, timings = render_pages(generate_page, to_render, template_path, basepath, jobs, profile is not None,
+                                  cache, writer, page_urls, compressor, asset_urls)
+        for item_path, phases in timings:
+            profile.add(item_path, phases)
+    elif queue_depth > 0 and len(to_render) > 1:
+        render_pipelined(to_render, template_path, basepath, queue_depth, profile, cache, writer, page_urls,
+                         asset_urls)
+    else:
+        for item_path, output_path in to_render:
             print(f"Copying content files from {item_path} to {output_path}")
-            try_generate_page(item_path, template_path, output_path, basepath)
-        else:
-            generate_html_recursive(item_path, public_dir,template_path,basepath, item)
-    content_path = os.path.join(project_dir, "content", "index.md")    
+            timer = PageTimer() if profile else None
+            page_urls[item_path] = try_generate_page(item_path, template_path, output_path, basepath, timer,
+                                                     cache, writer, asset_urls)
+            if profile:
+                profile.add(item_path, timer.phases)
+
+    for source_path, urls in page_urls.items():
+        entry = entries[os.path.relpath(source_path, content_path)]
+        entry["links"] = page_links(urls, entry["output"])
+
+    print(writer.stats())
+    if compressor:
+        finish_compression(compressor)
+    if cache is not None:
+        print(cache.stats())
+        cache.save()
+
+    if profile:
+        profile.print_summary()
+        profile.write_report(profile_path)
+        print(f"Wrote profile report to {profile_path}")
+
+    print(f"Rendered {len(to_render)} of {len(pages)} pages, removed {len(to_delete)} stale outputs")
+    if explain is not None:
+        print_explanation(explain, entries, reasons)
+
+    manifest.template_hash = template_hash
+    manifest.basepath = basepath
+    manifest.pages = entries
+    manifest.static = static_files
+    manifest.public_dir = os.path.abspath(public_dir)
+    manifest.save()
+
+    # Outputs and the manifest are kept even when links are broken, so the
+    # next incremental build only redoes the pages that get fixed.
+    if check_links:
+        run_link_check(entries, site_outputs, static_files, check_links)
+
+
+def run_link_check(entries, site_outputs, static_files, mode):
+    """Check the links every page rendered with, in this build or an earlier
+    one, against the site's page outputs and static files; `mode` "error"
+    fails the build on a broken link."""
+    from link_check import check_links
 
+    check_links(entries, static_files, fail=mode == "error", outputs=site_outputs)
 
 
-def generate_html_recursive(sub_dir, public_dir,template_path, basepath, relative_path="" ):
-    for item in os.listdir(sub_dir):
-        item_path = os.path.join(sub_dir, item)
+def cache_key(public_dir, default_root, shard=None):
+    """The .ssg-cache/ subdirectory for builds into `public_dir`. Every output
+    root and shard keeps its own manifest and caches, so building into one
+    never makes another's look up to date."""
+    parts = []
+    if not default_root:
+        digest = hashlib.blake2b(os.path.abspath(public_dir).encode('utf-8'), digest_size=6).hexdigest()
+        parts.append(f"output-{digest}")
+    if shard:
+        parts.append(f"shard-{shard[0]}-of-{shard[1]}")
+    return os.path.join(*parts) if parts else ""
+
+
+def finish_compression(compressor):
+    compressor.close()
+    print(compressor.stats())
+
+
+def print_explanation(query, entries, reasons):
+    for line in explain_lines(query, entries, reasons):
+        print(line)
+
+
+def render_pipelined(pages, template_path, basepath, queue_depth, profile=None, cache=None, writer=None,
+                     page_urls=None, assets=()):
+    """Render pages with reads and writes overlapping rendering; see
+    pipeline.run_pipeline. Sources are read whole so a reader thread can
+    fetch them ahead of the renderer. The URLs each written page links to are
+    recorded in `page_urls`."""
+    from pipeline import run_pipeline
+    from profiling import NULL_TIMER, PageTimer
+
+    def read(page):
+        timer = PageTimer() if profile else None
+        with (timer or NULL_TIMER).phase("read"):
+            with open(page[0], 'rb') as f:
+                return f.read(), timer
+
+    def render(page, source):
+        data, timer = source
+        urls = []
+        return "".join(render_page(data, template_path, basepath, timer, cache, urls, assets)), timer, urls
+
+    def write(page, result):
+        html, timer, urls = result
+        with (timer or NULL_TIMER).phase("write"):
+            writer.write(page[1], [html])
+        if page_urls is not None:
+            page_urls[page[0]] = urls
+        if profile:
+            profile.add(page[0], timer.phases)
+
+    print(f"Rendering {len(pages)} pages through a pipeline of depth {queue_depth}")
+    run_pipeline(pages, read, render, write, queue_depth)
+
+
+def find_pages(content_dir, public_dir, relative_path=""):
+    pages = []
+    for item in sorted(os.listdir(os.path.join(content_dir, relative_path))):
         relative_item_path = os.path.join(relative_path, item)
-        
+        item_path = os.path.join(content_dir, relative_item_path)
+
         if os.path.isfile(item_path):
-            relative_item_path = relative_item_path.replace(".md", ".html")
-            dest_path = os.path.join(public_dir, relative_item_path)
-            print(f"Copying content files from {item_path} to {dest_path}")
-            try_generate_page(item_path, template_path, dest_path, basepath)
+            pages.append((item_path, page_output_path(public_dir, relative_item_path)))
         else:
-            generate_html_recursive(item_path, public_dir, template_path, basepath, relative_item_path)
+            pages.extend(find_pages(content_dir, public_dir, relative_item_path))
+    return pages
+
+
+def page_output_path(public_dir, relative_path):
+    if relative_path.endswith(".md"):
+        relative_path = relative_path[:-len(".md")] + ".html"
+    return os.path.join(public_dir, relative_path)
 
-def try_generate_page(content_path, template_path, output_path, basepath):
+
+def remove_empty_dirs(directory, stop_dir):
+    while os.path.abspath(directory) != os.path.abspath(stop_dir) and not os.listdir(directory):
+        os.rmdir(directory)
+        directory = os.path.dirname(directory)
+
+def try_generate_page(content_path, template_path, output_path, basepath, timer=None, cache=None, writer=None,
+                      assets=()):
     try:
-        generate_page(content_path, template_path, output_path, basepath)
+        urls = generate_page(content_path, template_path, output_path, basepath, timer, cache, writer, assets)
         print("Site generation completed successfully!")
+        return urls
     except Exception as e:
         print(f"Error generating site: {e}")
         raise
 
-def generate_page(from_path, template_path, dest_path, basepath):
+def generate_page(from_path, template_path, dest_path, basepath, timer=None, cache=None, writer=None, assets=()):
+    """Render the page at `from_path` to `dest_path`. Returns the URLs of its
+    links and images."""
+    from output import OutputWriter
+    from profiling import NULL_TIMER
+    from source import open_source
 
-    with open(from_path, 'r', encoding='utf-8') as f:
-        markdown_content = f.read()
-    
-    with open(template_path, 'r', encoding='utf-8') as f:
-        template_content = f.read()
+    if writer is None:
+        writer = OutputWriter()
 
-    title = extract_title(markdown_content)
+    urls = []
+    with contextlib.ExitStack() as stack:
+        with (timer or NULL_TIMER).phase("read"):
+            view = stack.enter_context(open_source(from_path))
+        chunks = render_page(view, template_path, basepath, timer, cache, urls, assets)
+        with (timer or NULL_TIMER).phase("write"):
+            writer.write(dest_path, chunks)
+    return urls
 
-    html_content = markdown_to_html_node(markdown_content)
-    
-    html_content = html_content.to_html()
 
+def render_page(view, template_path, basepath, timer=None, cache=None, urls=None, assets=()):
+    """The page for the markdown source in bytes `view`, as text chunks.
 
-    final_html = template_content.replace('{{ Title }}', title)
-    final_html = final_html.replace('{{ Content }}', html_content)
-    if basepath != "/":
-        final_html = final_html.replace('href="/', f'href="{basepath}').replace('src="/', f'src="{basepath}')
+    Each stage is a generator, so when the chunks are written out a block is
+    decoded, parsed and rendered before the next, and memory beyond the view
+    is bounded by the largest block. With a `timer` each stage runs in full
+    to time it and the page comes back as a single chunk. The URLs of the
+    page's links and images, outside code blocks, are appended to `urls` as
+    its blocks are rendered. Site-absolute URLs of the fingerprinted
+    `assets`, (url, fingerprinted url) pairs, are rewritten to the
+    fingerprinted names in the template and the page alike.
+    """
+    from htmlnode import LeafNode, ParentNode
+    from dependencies import block_urls
+    from itertools import chain
+    from markdown_to_blocks import BlockType, iter_blocks
+    from markdown_to_html import block_to_html, block_to_node
+    from profiling import NULL_TIMER
+    from source import find_title, iter_lines, read_front_matter
+    from template import load_template
+    from urls import get_resolver
 
-    dest_dir = os.path.dirname(dest_path)
-    if dest_dir and not os.path.exists(dest_dir):
-        os.makedirs(dest_dir, exist_ok=True)
-    
-    with open(dest_path, 'w', encoding='utf-8') as f:
-        f.write(final_html)
+    profiling = timer is not None
+    if not profiling:
+        timer = NULL_TIMER
 
+    resolve_url = get_resolver(basepath, assets)
+    context = resolve_url.context if resolve_url else basepath
+    template = load_template(template_path, resolve_url)
 
-def convert(project_dir, public_dir):
-    
-    
-    static_dir = os.path.join(project_dir, "static")
-    
-    if os.path.exists(public_dir):
-        print("Removing existing public directory contents.")
-        shutil.rmtree(public_dir)
-        
-    os.makedirs(public_dir, exist_ok=True)
-    
-    if os.path.exists(static_dir):
-        print(f"Copying static files from {static_dir} to {public_dir}")
-        for item in os.listdir(static_dir):
-            src_path = os.path.join(static_dir, item)
-            dst_path = os.path.join(public_dir, item)
-            
-            if os.path.isfile(src_path):
-                print(f"Copying files {src_path} to {dst_path}")
-                shutil.copy2(src_path, dst_path)
-            elif os.path.isdir(src_path):
-                convert_helper(src_path, dst_path)
-        print("Static files copied successfully!")
+    def render_block(block):
+        return block_to_html(block, resolve_url)
+
+    def render_blocks(blocks):
+        for block in blocks:
+            if urls is not None and block.block_type is not BlockType.CODE:
+                urls.extend(block_urls(block.text))
+            if cache is None:
+                yield block_to_node(block, resolve_url, inline_html=True)
+            else:
+                yield LeafNode(None, cache.render(block, context, render_block))
+
+    with timer.phase("extract_title"):
+        values, body_start = read_front_matter(view)
+        # A front matter title wins over the page's first h1.
+        if "title" not in values:
+            values["title"] = find_title(view, body_start)
+
+    lines = iter_lines(view, body_start)
+    if profiling:
+        with timer.phase("read"):
+            lines = list(lines)
+    blocks = iter_blocks(lines)
+    if profiling:
+        with timer.phase("markdown_to_blocks"):
+            blocks = list(blocks)
+    children = render_blocks(blocks)
+    if profiling:
+        # Cache hits skip parsing; misses are timed as inline parsing since
+        # that dominates rendering a block.
+        with timer.phase("inline_parsing"):
+            children = list(children)
+    # Streamed children are a generator, which ParentNode cannot tell is
+    # empty, so look for a first child here. A page with no body, such as
+    # one that is only front matter, gets an empty div on either path.
+    children = iter(children)
+    first = next(children, None)
+    if first is None:
+        values["content"] = LeafNode("div", "")
     else:
-        print("No static directory found, skipping static file copying")
+        values["content"] = ParentNode("div", chain([first], children))
 
-def convert_helper(sub_dir, public_dir, relative_path=""):
+    if not profiling:
+        return template.iter_render(values)
+    with timer.phase("to_html"):
+        values["content"] = values["content"].to_html()
+    with timer.phase("template"):
+        return [template.render(values)]
 
-    for item in os.listdir(sub_dir):
-        item_path = os.path.join(sub_dir, item)
-        relative_item_path = os.path.join(relative_path, item)
-        dest_path = os.path.join(public_dir, relative_item_path)
-        
-        if os.path.isfile(item_path):
-            os.makedirs(os.path.dirname(dest_path), exist_ok=True)
-            shutil.copy2(item_path, dest_path)
-            print(f"Copied: {item_path} -> {dest_path}")
-        else:
-            convert_helper(item_path, public_dir, relative_item_path)
 
+def split_front_matter(markdown):
+    """Front matter values and the remaining body of a page already in memory."""
+    from source import read_front_matter
+
+    encoded = markdown.encode('utf-8')
+    values, body_start = read_front_matter(encoded)
+    return values, encoded[body_start:].decode('utf-8')
 
-def extract_title(markdown):
 
-    lines = markdown.split('\n')    
-    for line in lines:
-        if re.match(r'^#\s+', line):
-            title = line[1:].strip()
-            if title:  
-                return title
-    
+def extract_title(markdown):
+    from source import find_title
 
-    raise Exception("No h1 header found in markdown content")
+    return find_title(markdown.encode('utf-8'))
 
 if __name__ == "__main__":
   main()
\ No newline at end of file
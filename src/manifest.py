@@ -0,0 +1,146 @@
+from dependencies import DependencyGraph
+from jsonfile import load_json, save_json_atomic
+import hashlib, os
+
+# Version 2 added each page's links, which the dependency graph is built from.
+MANIFEST_VERSION = 2
+
+
+def hash_file(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class Manifest:
+    """On-disk record of what the last build rendered and from which inputs."""
+
+    def __init__(self, path, template_hash=None, basepath=None, pages=None, static=None, public_dir=None):
+        self.path = path
+        self.template_hash = template_hash
+        self.basepath = basepath
+        self.pages = pages if pages else {}
+        self.static = static if static else []
+        # The output root the record describes; outputs are relative to it.
+        self.public_dir = public_dir
+
+    @classmethod
+    def load(cls, path):
+        data = load_json(path, MANIFEST_VERSION)
+        if data is None:
+            return cls(path)
+        return cls(path, data.get("template_hash"), data.get("basepath"), data.get("pages"), data.get("static"),
+                   data.get("public_dir"))
+
+    @classmethod
+    def load_for(cls, path, public_dir):
+        """The manifest at `path` if it records a build into `public_dir`,
+        otherwise an empty one: another root's outputs say nothing about
+        what this one holds."""
+        manifest = cls.load(path)
+        public_dir = os.path.abspath(public_dir)
+        if manifest.public_dir != public_dir:
+            manifest = cls(path, public_dir=public_dir)
+        return manifest
+
+    def save(self):
+        save_json_atomic(self.path, {
+            "version": MANIFEST_VERSION,
+            "template_hash": self.template_hash,
+            "basepath": self.basepath,
+            "pages": self.pages,
+            "static": self.static,
+            "public_dir": self.public_dir,
+        }, indent=1)
+
+    def matches(self, template_hash, basepath, pages, static):
+        """True when saving these values would not change the manifest."""
+        return (self.template_hash == template_hash and self.basepath == basepath
+                and self.pages == pages and self.static == static)
+
+    def source_entry(self, source_key, source_path):
+        # A matching size and mtime means the file is untouched; only hash the
+        # source when the cheap stat check says it might have changed.
+        stat = os.stat(source_path)
+        entry = self.pages.get(source_key)
+        if entry and entry["size"] == stat.st_size and entry["mtime_ns"] == stat.st_mtime_ns:
+            content_hash = entry["hash"]
+        else:
+            content_hash = hash_file(source_path)
+        return {"hash": content_hash, "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+    def plan(self, pages, content_dir, public_dir, template_hash, basepath, force=False, changed_assets=(),
+             template_assets=()):
+        """Work out which pages need rendering and which outputs are stale.
+
+        `pages` is a list of (source_path, dest_path) pairs and
+        `changed_assets` the site paths ("/images/a.png") of static files
+        added, changed or removed since the last build. `template_assets`
+        are the site paths the template references, which `template_hash`
+        covers when assets are fingerprinted. Returns the pages to
+        render, the output paths to delete, the new page entries and, for
+        each page to render, the reason it needs it. With `force` every page
+        is rendered.
+        """
+        if force:
+            rebuild_all = "full build"
+        elif self.template_hash is None:
+            rebuild_all = "no previous build"
+        elif self.template_hash != template_hash:
+            changed = [asset for asset in sorted(changed_assets) if asset in template_assets]
+            if len(changed) == 1:
+                rebuild_all = f"template asset {changed[0]} changed"
+            elif changed:
+                rebuild_all = f"template assets {', '.join(changed)} changed"
+            else:
+                rebuild_all = "template changed"
+        elif self.basepath != basepath:
+            rebuild_all = f"basepath changed from {self.basepath} to {basepath}"
+        else:
+            rebuild_all = None
+
+        graph = DependencyGraph(self.pages)
+        asset_reasons = {}
+        for asset in sorted(changed_assets):
+            for source_key in graph.dependents(asset):
+                asset_reasons.setdefault(source_key, f"linked asset {asset} changed")
+
+        to_render = []
+        entries = {}
+        reasons = {}
+        for source_path, dest_path in pages:
+            source_key = os.path.relpath(source_path, content_dir)
+            entry = self.source_entry(source_key, source_path)
+            entry["output"] = os.path.relpath(dest_path, public_dir)
+            old_entry = self.pages.get(source_key)
+            # Links are only known after rendering; until then keep the last ones.
+            entry["links"] = old_entry.get("links", []) if old_entry else []
+
+            if rebuild_all:
+                reason = rebuild_all
+            elif not old_entry:
+                reason = "new page"
+            elif old_entry["hash"] != entry["hash"]:
+                reason = "source changed"
+            elif old_entry["output"] != entry["output"]:
+                reason = "output path changed"
+            elif not os.path.exists(dest_path):
+                reason = "output missing"
+            else:
+                reason = asset_reasons.get(source_key)
+
+            if reason:
+                to_render.append((source_path, dest_path))
+                reasons[source_key] = reason
+            entries[source_key] = entry
+
+        live_outputs = {entry["output"] for entry in entries.values()}
+        to_delete = []
+        for source_key, old_entry in self.pages.items():
+            output = old_entry["output"]
+            if output not in live_outputs:
+                to_delete.append(os.path.join(public_dir, output))
+
+        return to_render, to_delete, entries, reasons
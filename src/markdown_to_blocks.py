@@ -1,5 +1,5 @@
 from enum import Enum
-import re
+from patterns import HEADING_PATTERN
 
 class BlockType(Enum):
     PARAGRAPH = "paragraph"
@@ -9,51 +9,122 @@ class BlockType(Enum):
     UNORDERED_LIST = "unordered_list"
     ORDERED_LIST = "ordered_list"
 
-def is_quote_block(block):
-    for line in block.split("\n"):
-        if not line.startswith(">"):
-            return False
-    return True
-
-def is_unordered_list(block):
-    for line in block.split("\n"):
-        if not line.startswith("- "):
-            return False
-    return True
-
-def is_ordered_list(block):
-    num = 1
-    for line in block.split("\n"):
-        if not line.startswith(f"{num}. "):
-            return False
-        num += 1
-    return True
+class Block:
+    """One block of a document: its type, its lines, and the half-open range
+    [start, end) of line numbers it came from."""
 
-def detect_block_type(markdown_block):
-    match markdown_block:
-        case s if re.match(r"^#{1,6} ", s):
-            return BlockType.HEADING
-        case s if s.startswith("```") and s.endswith("```") and len(s) >= 6:
-            return BlockType.CODE
-        case s if is_quote_block(s):
-            return BlockType.QUOTE
-        case s if is_unordered_list(s):
-            return BlockType.UNORDERED_LIST
-        case s if is_ordered_list(s):
-            return BlockType.ORDERED_LIST
-        case _:
+    __slots__ = ("block_type", "lines", "start", "end")
+
+    def __init__(self, block_type, lines, start=0, end=None):
+        self.block_type = block_type
+        self.lines = lines
+        self.start = start
+        self.end = start + len(lines) if end is None else end
+
+    @property
+    def text(self):
+        return "\n".join(self.lines)
+
+    def __eq__(self, other):
+        return (isinstance(other, Block) and self.block_type == other.block_type
+                and self.lines == other.lines and self.start == other.start and self.end == other.end)
+
+    def __repr__(self):
+        return f"Block({self.block_type}, {self.lines!r}, {self.start}, {self.end})"
+
+
+def classify_lines(lines):
+    """The BlockType of a block, checking the quote, list and ordered list
+    markers together in one pass over its lines."""
+    first = lines[0]
+    if HEADING_PATTERN.match(first):
+        return BlockType.HEADING
+    if first.startswith("```") and lines[-1].endswith("```") and (len(lines) > 1 or len(first) >= 6):
+        return BlockType.CODE
+
+    quote = unordered = ordered = True
+    for number, line in enumerate(lines, 1):
+        quote = quote and line.startswith(">")
+        unordered = unordered and line.startswith("- ")
+        ordered = ordered and line.startswith(f"{number}. ")
+        if not (quote or unordered or ordered):
             return BlockType.PARAGRAPH
+    if quote:
+        return BlockType.QUOTE
+    if unordered:
+        return BlockType.UNORDERED_LIST
+    return BlockType.ORDERED_LIST
+
+def detect_block_type(markdown_block):
+    return classify_lines(markdown_block.split("\n"))
+
+
+def opens_fence(first_line):
+    """True when a block's first line opens a fenced code block, as opposed
+    to holding a whole ```code``` span on its own."""
+    first_line = first_line.rstrip()
+    return first_line.startswith("```") and not (len(first_line) >= 6 and first_line.endswith("```"))
+
+def make_block(lines, start, end, block_type=None):
+    lines[0] = lines[0].lstrip()
+    lines[-1] = lines[-1].rstrip()
+    return Block(block_type or classify_lines(lines), lines, start, end)
+
+def iter_blocks(lines, start=0):
+    """Yield typed Blocks from an iterable of lines without their newlines,
+    holding no more than the current block in memory.
+
+    Blocks are separated by blank (or whitespace-only) lines, except inside
+    a fenced code block, which runs to its closing fence so code may contain
+    blank lines. As with the old split on blank lines, the first line of a
+    block loses its leading whitespace and the last its trailing whitespace.
+    `start` is the line number of the first line, for the blocks' ranges.
+    """
+    numbered = enumerate(lines, start)
+    block_lines = []
+    block_start = number = start
+    fenced = False
+    can_fence = True
+    while True:
+        for number, line in numbered:
+            if fenced:
+                block_lines.append(line)
+                if line.strip() == "```":
+                    yield make_block(block_lines, block_start, number + 1, BlockType.CODE)
+                    block_lines = []
+                    fenced = False
+            elif not line.strip():
+                if block_lines:
+                    yield make_block(block_lines, block_start, number)
+                    block_lines = []
+            else:
+                if not block_lines:
+                    block_start = number
+                    fenced = can_fence and opens_fence(line.lstrip())
+                block_lines.append(line)
+
+        if not fenced:
+            break
+        # The fence never closed, so it was an ordinary block after all: it
+        # ends at the first blank line and the rest is scanned again. No
+        # closing fence follows, so the rescan opens no fences and reads each
+        # line once more.
+        end = next((index for index, line in enumerate(block_lines) if not line.strip()), len(block_lines))
+        yield make_block(block_lines[:end], block_start, block_start + end)
+        numbered = enumerate(block_lines[end:], block_start + end)
+        number = block_start + end
+        block_lines = []
+        fenced = can_fence = False
 
+    if block_lines:
+        yield make_block(block_lines, block_start, number + 1)
 
+def scan_blocks(markdown):
+    """Split a whole document into a list of typed Blocks; see iter_blocks."""
+    return list(iter_blocks(markdown.split("\n")))
 
 def markdown_to_blocks(markdown):
-    blocks = markdown.split("\n\n")
-    cleaned_blocks = []
-    for block in blocks:
-        block = block.strip()
-        if block:
-            cleaned_blocks.append(block)
-    return cleaned_blocks
+    return [block.text for block in scan_blocks(markdown)]
 
 
 def main():
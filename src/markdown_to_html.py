@@ -1,57 +1,66 @@
-from markdown_to_blocks import detect_block_type, markdown_to_blocks, BlockType
+from markdown_to_blocks import BlockType, scan_blocks
 from htmlnode import ParentNode, LeafNode, HTMLNode
-from markdown_to_nodes import text_to_nodes
+from markdown_to_nodes import text_to_html, text_to_nodes
+from patterns import HEADING_PARTS_PATTERN, ORDERED_ITEM_PATTERN, QUOTE_MARKER_PATTERN
 from textnode import TextNode, TextType
-import re
             
-def markdown_to_html_node(markdown):
-    blocks = markdown_to_blocks(markdown)
+def markdown_to_html_node(markdown, resolve_url=None, inline_html=False):
     html_children = []
     
-    for block in blocks:
-        block_type = detect_block_type(block)
-        html_node = convert_block_to_html(block, block_type)
+    for block in scan_blocks(markdown):
+        html_node = block_to_node(block, resolve_url, inline_html)
         html_children.append(html_node)
     
     return ParentNode("div", html_children, None)
 
 
-def convert_block_to_html(block, block_type):
+def block_to_html(block, resolve_url=None):
+    return block_to_node(block, resolve_url, inline_html=True).to_html()
+
+
+def block_to_node(block, resolve_url=None, inline_html=False):
+    return lines_to_html(block.lines, block.block_type, resolve_url, inline_html)
+
+
+def convert_block_to_html(block, block_type, resolve_url=None, inline_html=False):
+    return lines_to_html(block.split("\n"), block_type, resolve_url, inline_html)
+
+
+def lines_to_html(lines, block_type, resolve_url=None, inline_html=False):
     match block_type:
         case BlockType.PARAGRAPH:
-            return create_paragraph_node(block)
+            return create_paragraph_node(lines, resolve_url, inline_html)
         case BlockType.HEADING:
-            return create_heading_node(block)
+            return create_heading_node(lines, resolve_url, inline_html)
         case BlockType.CODE:
-            return create_code_node(block)
+            return create_code_node(lines)
         case BlockType.ORDERED_LIST:
-            return create_ordered_list_node(block)
+            return create_ordered_list_node(lines, resolve_url, inline_html)
         case BlockType.UNORDERED_LIST:
-            return create_unordered_list_node(block)
+            return create_unordered_list_node(lines, resolve_url, inline_html)
         case BlockType.QUOTE:
-            return create_quote_node(block)
+            return create_quote_node(lines, resolve_url, inline_html)
         case _:
             raise ValueError(f"Unsupported block type: {block_type}")
 
-def create_paragraph_node(block):
-    paragraph_text = " ".join(line.strip() for line in block.split("\n"))
-    children = text_to_children(paragraph_text)
+def create_paragraph_node(lines, resolve_url=None, inline_html=False):
+    paragraph_text = " ".join(line.strip() for line in lines)
+    children = text_to_children(paragraph_text, resolve_url, inline_html)
     return ParentNode("p", children)
 
 
-def create_heading_node(block):
-    heading_match = re.match(r'^(#{1,6})\s+(.+)', block)
+def create_heading_node(lines, resolve_url=None, inline_html=False):
+    heading_match = HEADING_PARTS_PATTERN.match(lines[0])
     if not heading_match:
         raise ValueError("Invalid heading format")
     
     level = len(heading_match.group(1))
     heading_text = heading_match.group(2).strip()
-    children = text_to_children(heading_text)
+    children = text_to_children(heading_text, resolve_url, inline_html)
     return ParentNode(f"h{level}", children)
 
 
-def create_code_node(block):
-    lines = block.split("\n")
+def create_code_node(lines):
     if len(lines) < 2 or not lines[0].startswith("```") or not lines[-1].strip() == "```":
         raise ValueError("Invalid code block format")
     
@@ -61,24 +70,22 @@ def create_code_node(block):
     return ParentNode("pre", [code_element])
 
 
-def create_ordered_list_node(block):
-    lines = block.split("\n")
+def create_ordered_list_node(lines, resolve_url=None, inline_html=False):
     list_items = []
     
     for i, line in enumerate(lines, 1):
-        item_match = re.match(rf'^{i}\.\s+(.+)', line)
-        if not item_match:
+        item_match = ORDERED_ITEM_PATTERN.match(line)
+        if not item_match or item_match.group(1) != str(i):
             raise ValueError(f"Invalid ordered list item format at line {i}")
         
-        item_text = item_match.group(1)
-        item_children = text_to_children(item_text)
+        item_text = item_match.group(2)
+        item_children = text_to_children(item_text, resolve_url, inline_html)
         list_items.append(ParentNode("li", item_children))
     
     return ParentNode("ol", list_items)
 
 
-def create_unordered_list_node(block):
-    lines = block.split("\n")
+def create_unordered_list_node(lines, resolve_url=None, inline_html=False):
     list_items = []
     
     for line in lines:
@@ -86,52 +93,37 @@ def create_unordered_list_node(block):
             raise ValueError("Invalid unordered list item format")
         
         item_text = line[2:].strip()
-        item_children = text_to_children(item_text)
+        item_children = text_to_children(item_text, resolve_url, inline_html)
         list_items.append(ParentNode("li", item_children))
     
     return ParentNode("ul", list_items)
 
 
-def create_quote_node(block):
-    lines = block.split("\n")
+def create_quote_node(lines, resolve_url=None, inline_html=False):
     quote_lines = []
     
     for line in lines:
         if not line.startswith(">"):
             raise ValueError("Invalid quote block format")
-        clean_line = re.sub(r'^>\s?', '', line)
+        clean_line = QUOTE_MARKER_PATTERN.sub('', line)
         quote_lines.append(clean_line)
     
     quote_text = " ".join(quote_lines)
-    children = text_to_children(quote_text)
+    children = text_to_children(quote_text, resolve_url, inline_html)
     return ParentNode("blockquote", children)
 
 
-def markdown_to_blocks(markdown):   
-    blocks = markdown.split("\n\n")
-    filtered_blocks = []
-    for block in blocks:
-        if block == "":
-            continue
-        block = block.strip()
-        filtered_blocks.append(block)
-    return filtered_blocks
-
-def markdown_to_blocks(markdown):
-    blocks = markdown.split("\n\n")
-    filtered_blocks = []
-    for block in blocks:
-        if block == "":
-            continue
-        block = block.strip()
-        filtered_blocks.append(block)
-    return filtered_blocks
-
-def text_to_children(text):
+def text_to_children(text, resolve_url=None, inline_html=False):
+    if inline_html:
+        # Fast path: the whole run of inline markdown becomes one raw leaf,
+        # skipping the TextNode and LeafNode per span.
+        html = text_to_html(text, resolve_url)
+        return [LeafNode(None, html)] if html else []
+
     text_nodes = text_to_nodes(text)
     children = []
     for text_node in text_nodes:
-        html_node = text_node.text_node_to_html_node()
+        html_node = text_node.text_node_to_html_node(resolve_url)
         children.append(html_node)
     return children
 
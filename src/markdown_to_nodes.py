@@ -1,5 +1,12 @@
+from patterns import DELIMITER_PATTERN, IMAGE_PATTERN, LINK_PATTERN
 from textnode import TextNode, TextType
-import re
+
+# Delimiters are ranked in the order the cascade splits on them: "**" is literal
+# only inside bold, "_" is literal inside bold or italic, "`" inside any span.
+DELIMITER_TYPES = {"**": TextType.BOLD, "_": TextType.ITALIC, "`": TextType.CODE}
+DELIMITER_RANK = {TextType.BOLD: 0, TextType.ITALIC: 1, TextType.CODE: 2}
+INLINE_TAGS = {TextType.BOLD: "b", TextType.ITALIC: "i", TextType.CODE: "code"}
+
 
 def split_nodes(old_nodes, delim, type):
     if isinstance(old_nodes, TextNode):
@@ -75,18 +82,100 @@ def split_nodes_link(old_nodes):
     return new_nodes
 
 def extract_markdown_images(text):
-    pattern = r"!\[([^\[\]]*)\]\(([^\(\)]*)\)"
-    matches = re.findall(pattern, text)
-    return matches
+    return IMAGE_PATTERN.findall(text)
 
 
 def extract_markdown_links(text):
-    pattern = r"(?<!!)\[([^\[\]]*)\]\(([^\(\)]*)\)"
-    matches = re.findall(pattern, text)
-    return matches
+    return LINK_PATTERN.findall(text)
 
 
 def text_to_nodes(text):
+    """Tokenize inline markdown in one left-to-right scan.
+
+    Produces the same nodes as `text_to_nodes_cascade` without building an
+    intermediate node list per delimiter or re-splitting the remaining text
+    for every image and link.
+    """
+    nodes = []
+    append = nodes.append
+
+    def emit(value, text_type, url=None):
+        append(TextNode(value, text_type, url))
+
+    scan_inline(text, emit)
+    return nodes
+
+
+def text_to_html(text, resolve_url=None):
+    """Render inline markdown straight to HTML.
+
+    The output matches converting `text_to_nodes(text)` through
+    `text_node_to_html_node(resolve_url).to_html()`, without allocating the
+    TextNodes and LeafNodes in between.
+    """
+    parts = []
+    append = parts.append
+
+    def emit(value, text_type, url=None):
+        if text_type is TextType.NORMAL:
+            append(value)
+        elif text_type is TextType.LINK:
+            append(f'<a href="{resolve_url(url) if resolve_url else url}">{value}</a>')
+        elif text_type is TextType.IMAGE:
+            append(f'<img src="{resolve_url(url) if resolve_url else url}" alt="{value}"></img>')
+        else:
+            tag = INLINE_TAGS[text_type]
+            append(f"<{tag}>{value}</{tag}>")
+
+    scan_inline(text, emit)
+    return "".join(parts)
+
+
+def scan_inline(text, emit):
+    """Call `emit(text, text_type, url=None)` for each inline span in order."""
+    pos = 0
+    for image in IMAGE_PATTERN.finditer(text):
+        scan_links(text, pos, image.start(), emit)
+        emit(image.group(1), TextType.IMAGE, image.group(2))
+        pos = image.end()
+    scan_links(text, pos, len(text), emit)
+
+
+def scan_links(text, start, end, emit):
+    pos = start
+    for link in LINK_PATTERN.finditer(text, start, end):
+        scan_delimiters(text, pos, link.start(), emit)
+        emit(link.group(1), TextType.LINK, link.group(2))
+        pos = link.end()
+    scan_delimiters(text, pos, end, emit)
+
+
+def scan_delimiters(text, start, end, emit):
+    open_type = None
+    pos = start
+    for match in DELIMITER_PATTERN.finditer(text, start, end):
+        text_type = DELIMITER_TYPES[match.group()]
+        if open_type is None:
+            if match.start() > pos:
+                emit(text[pos:match.start()], TextType.NORMAL)
+            open_type = text_type
+        elif open_type is text_type:
+            if match.start() > pos:
+                emit(text[pos:match.start()], open_type)
+            open_type = None
+        elif DELIMITER_RANK[text_type] < DELIMITER_RANK[open_type]:
+            raise ValueError("invalid markdown, formatted section not closed")
+        else:
+            continue
+        pos = match.end()
+
+    if open_type is not None:
+        raise ValueError("invalid markdown, formatted section not closed")
+    if end > pos:
+        emit(text[pos:end], TextType.NORMAL)
+
+
+def text_to_nodes_cascade(text):
     result = split_nodes_image([TextNode(text, TextType.NORMAL)])    
     result = split_nodes_link(result)
     result = split_nodes(result, "**", TextType.BOLD)
@@ -0,0 +1,155 @@
+from static_sync import list_files
+import json, os, threading
+
+# Rendered text is encoded and compared against the existing file in pieces
+# of about this many bytes.
+WRITE_BUFFER_SIZE = 1 << 16
+# Marks a directory as an output root this generator owns, so a full build
+# may delete whatever in it the build did not produce. Shard roots record
+# which shard they hold.
+OUTPUT_MARKER = ".ssg-output"
+
+
+def read_marker(public_dir):
+    """The output marker of `public_dir` ({"shard": [i, N] or None}), or None
+    if the generator never claimed the directory."""
+    try:
+        with open(os.path.join(public_dir, OUTPUT_MARKER), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError):
+        return {}
+
+
+def claim_output_root(public_dir, shard=None, known_root=False):
+    """Mark `public_dir` as an output root of this generator, for `shard`
+    ((i, N)) or the whole site. Returns whether the generator owns it: it
+    was marked before, is missing or empty, or is a `known_root` the site
+    has always been built into (which is not marked unless it holds a
+    shard). A non-empty directory the generator never wrote is not claimed.
+    """
+    marker = read_marker(public_dir)
+    if marker is None and not known_root and os.path.isdir(public_dir) and os.listdir(public_dir):
+        return False
+    contents = {"shard": list(shard) if shard else None}
+    if marker != contents and (shard or not known_root or marker is not None):
+        os.makedirs(public_dir, exist_ok=True)
+        with open(os.path.join(public_dir, OUTPUT_MARKER), 'w', encoding='utf-8') as f:
+            json.dump(contents, f)
+    return True
+
+
+def list_outputs(public_dir):
+    """Relative paths of every file under `public_dir` except its marker."""
+    return [relative_path for relative_path in list_files(public_dir) if relative_path != OUTPUT_MARKER]
+
+
+def encode_chunks(chunks, size=WRITE_BUFFER_SIZE):
+    """Join a stream of small text chunks into UTF-8 pieces of about `size`."""
+    buffer = []
+    length = 0
+    for chunk in chunks:
+        buffer.append(chunk)
+        length += len(chunk)
+        if length >= size:
+            yield "".join(buffer).encode('utf-8')
+            buffer = []
+            length = 0
+    if buffer:
+        yield "".join(buffer).encode('utf-8')
+
+
+def open_temp(tmp_path, existing, prefix_length):
+    """Start a temp file holding the first `prefix_length` bytes of `existing`,
+    the part of the old output the new one was found to share."""
+    tmp = open(tmp_path, 'wb')
+    if prefix_length:
+        existing.seek(0)
+        while prefix_length:
+            data = existing.read(min(prefix_length, WRITE_BUFFER_SIZE))
+            tmp.write(data)
+            prefix_length -= len(data)
+    return tmp
+
+
+class OutputWriter:
+    """Writes rendered pages, leaving a file untouched when its content is
+    unchanged so its mtime survives for rsync and CDN uploads.
+
+    New content streams into a temp file that is renamed over the old one,
+    so readers never see a half-written page. Directories already created
+    are remembered for the life of the writer. A writer may be shared by
+    threads writing different files. With a `compressor`, every page is
+    submitted to it along with whether its content changed.
+    """
+
+    def __init__(self, compressor=None):
+        self.compressor = compressor
+        self.directories = set()
+        self.written = 0
+        self.skipped = 0
+        self.lock = threading.Lock()
+
+    def make_dirs(self, directory):
+        if directory and directory not in self.directories:
+            os.makedirs(directory, exist_ok=True)
+            self.directories.add(directory)
+
+    def write(self, dest_path, chunks):
+        """Write the text `chunks` to `dest_path` unless it already holds
+        exactly that. Returns True if the file was written."""
+        self.make_dirs(os.path.dirname(dest_path))
+        try:
+            existing = open(dest_path, 'rb')
+        except FileNotFoundError:
+            existing = None
+
+        # Compare against the old file as the page streams in; a temp file is
+        # only started at the first difference.
+        tmp_path = f"{dest_path}.{os.getpid()}.tmp"
+        tmp = None
+        matched = 0
+        try:
+            for data in encode_chunks(chunks, WRITE_BUFFER_SIZE):
+                if tmp is None and existing is not None:
+                    if existing.read(len(data)) == data:
+                        matched += len(data)
+                        continue
+                if tmp is None:
+                    tmp = open_temp(tmp_path, existing, matched)
+                tmp.write(data)
+
+            if tmp is None:
+                if existing is not None and not existing.read(1):
+                    with self.lock:
+                        self.skipped += 1
+                    if self.compressor is not None:
+                        self.compressor.submit(dest_path, changed=False)
+                    return False
+                tmp = open_temp(tmp_path, existing, matched)
+            tmp.close()
+            os.replace(tmp_path, dest_path)
+        except BaseException:
+            if tmp is not None:
+                tmp.close()
+            if os.path.lexists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        finally:
+            if existing is not None:
+                existing.close()
+
+        with self.lock:
+            self.written += 1
+        if self.compressor is not None:
+            self.compressor.submit(dest_path)
+        return True
+
+    def merge(self, written, skipped):
+        with self.lock:
+            self.written += written
+            self.skipped += skipped
+
+    def stats(self):
+        return f"Output: {self.written} pages written, {self.skipped} unchanged"
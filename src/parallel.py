@@ -0,0 +1,121 @@
+from compress import Compressor
+from concurrent.futures import ProcessPoolExecutor
+from output import OutputWriter
+from profiling import PageTimer
+from render_cache import BlockCache
+import os
+
+# Pages are sent to workers in batches so a task is a few dozen renders rather
+# than one pickled round trip per page.
+MAX_BATCH_SIZE = 64
+BATCHES_PER_WORKER = 4
+
+# Set in each worker by init_worker when the build uses a block cache.
+_worker_cache = None
+
+
+class RenderError(Exception):
+    def __init__(self, failures):
+        self.failures = failures
+        super().__init__(f"{len(failures)} page(s) failed to render")
+
+
+def resolve_jobs(jobs):
+    if jobs is None or jobs < 1:
+        return os.cpu_count() or 1
+    return jobs
+
+
+def make_batches(pages, jobs):
+    batch_size = -(-len(pages) // (jobs * BATCHES_PER_WORKER))
+    batch_size = max(1, min(MAX_BATCH_SIZE, batch_size))
+    return [pages[i:i + batch_size] for i in range(0, len(pages), batch_size)]
+
+
+def init_worker(cache_path, max_entries):
+    global _worker_cache
+    if cache_path:
+        _worker_cache = BlockCache.load(cache_path, max_entries, track_new=True)
+    else:
+        _worker_cache = BlockCache(max_entries, track_new=True)
+
+
+def render_batch(render, batch, template_path, basepath, profile=False, compress=False, assets=()):
+    failures = []
+    timings = []
+    urls = []
+    compressor = Compressor() if compress else None
+    writer = OutputWriter(compressor)
+    for source_path, dest_path in batch:
+        timer = PageTimer() if profile else None
+        try:
+            page_urls = render(source_path, template_path, dest_path, basepath, timer, _worker_cache, writer,
+                               assets)
+        except Exception as e:
+            failures.append((source_path, f"{type(e).__name__}: {e}"))
+            continue
+        urls.append((source_path, page_urls))
+        if profile:
+            timings.append((source_path, timer.phases))
+    compress_counts = None
+    if compressor is not None:
+        compressor.close()
+        compress_counts = (compressor.compressed, compressor.skipped)
+    cache_delta = _worker_cache.take_delta() if _worker_cache else None
+    return (len(batch) - len(failures), failures, timings, cache_delta, (writer.written, writer.skipped), urls,
+            compress_counts)
+
+
+def render_pages(render, pages, template_path, basepath, jobs, profile=False, cache=None, writer=None,
+                 page_urls=None, compressor=None, assets=()):
+    """Render (source_path, dest_path) pairs across a process pool.
+
+    `render` must be a module-level function with the signature of
+    `generate_page`. Every page is attempted; failures are collected and
+    raised together as a RenderError once the pool has drained. Returns the
+    number of pages rendered and, with `profile`, each page's phase timings.
+    With a block `cache`, each worker starts from the cache's saved file and
+    the blocks they render are merged back into it. A `writer`'s counts
+    are updated with the files the workers wrote and skipped, and
+    `page_urls` maps each rendered source path to the URLs it links to.
+    With a `compressor`, workers gzip the pages they write and its counts
+    are updated with theirs. `assets` is passed on to `render`.
+    """
+    if not pages:
+        return 0, []
+    jobs = resolve_jobs(jobs)
+    batches = make_batches(pages, jobs)
+    rendered = 0
+    failures = []
+    timings = []
+
+    if cache is not None:
+        initializer, initargs = init_worker, (cache.path, cache.max_entries)
+    else:
+        initializer, initargs = None, ()
+
+    with ProcessPoolExecutor(max_workers=min(jobs, len(batches)), initializer=initializer, initargs=initargs) as pool:
+        futures = [pool.submit(render_batch, render, batch, template_path, basepath, profile, compressor is not None,
+                               assets)
+                   for batch in batches]
+        for future in futures:
+            (count, batch_failures, batch_timings, cache_delta, write_counts, batch_urls,
+             compress_counts) = future.result()
+            rendered += count
+            failures.extend(batch_failures)
+            timings.extend(batch_timings)
+            if cache_delta:
+                cache.merge(*cache_delta)
+            if writer is not None:
+                writer.merge(*write_counts)
+            if page_urls is not None:
+                page_urls.update(batch_urls)
+            if compress_counts:
+                compressor.merge(*compress_counts)
+
+    print(f"Rendered {rendered} pages with {jobs} workers")
+    if failures:
+        for source_path, message in failures:
+            print(f"Error generating {source_path}: {message}")
+        raise RenderError(failures)
+    return rendered, timings
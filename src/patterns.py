@@ -0,0 +1,19 @@
+import re
+
+# Every pattern the markdown parser uses, compiled once at import so the hot
+# per-line paths never go through re's pattern cache.
+
+# Front matter and title, matched against a page's raw bytes
+FRONT_MATTER_FENCE_PATTERN = re.compile(rb"---\r?\n")
+TITLE_PATTERN = re.compile(rb"^#[^\S\n]+(.*)$", re.M)
+
+# Blocks
+HEADING_PATTERN = re.compile(r"#{1,6} ")
+HEADING_PARTS_PATTERN = re.compile(r"(#{1,6})\s+(.+)")
+ORDERED_ITEM_PATTERN = re.compile(r"(\d+)\.\s+(.+)")
+QUOTE_MARKER_PATTERN = re.compile(r"^>\s?")
+
+# Inline
+IMAGE_PATTERN = re.compile(r"!\[([^\[\]]*)\]\(([^\(\)]*)\)")
+LINK_PATTERN = re.compile(r"(?<!!)\[([^\[\]]*)\]\(([^\(\)]*)\)")
+DELIMITER_PATTERN = re.compile(r"\*\*|[_`]")
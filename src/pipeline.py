@@ -0,0 +1,96 @@
+from parallel import RenderError
+import queue, threading
+
+# Reads and writes mostly wait on the filesystem, so a few threads each keep
+# requests in flight while the calling thread renders.
+READ_WORKERS = 4
+WRITE_WORKERS = 2
+DEFAULT_QUEUE_DEPTH = 8
+
+_DONE = object()
+
+
+def start_threads(count, target):
+    threads = [threading.Thread(target=target, daemon=True) for _ in range(count)]
+    for thread in threads:
+        thread.start()
+    return threads
+
+
+def run_pipeline(pages, read, render, write, depth=DEFAULT_QUEUE_DEPTH,
+                 readers=READ_WORKERS, writers=WRITE_WORKERS):
+    """Pass (source_path, dest_path) pairs through read, render and write
+    stages that overlap: `read(page)` runs on `readers` threads,
+    `render(page, data)` on the calling thread, and `write(page, result)` on
+    `writers` threads.
+
+    The queues between the stages hold at most `depth` pages each, which
+    bounds how far reading can run ahead of rendering and rendering ahead of
+    writing. Every page is attempted; failures are raised together as a
+    RenderError once the stages have drained. Returns the number of pages
+    written.
+    """
+    if not pages:
+        return 0
+    pending = queue.SimpleQueue()
+    for page in pages:
+        pending.put(page)
+    read_queue = queue.Queue(maxsize=depth)
+    write_queue = queue.Queue(maxsize=depth)
+    failures = []
+
+    def fail(page, error):
+        failures.append((page[0], f"{type(error).__name__}: {error}"))
+
+    def read_stage():
+        while True:
+            try:
+                page = pending.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                read_queue.put((page, read(page), None))
+            except Exception as e:
+                read_queue.put((page, None, e))
+        read_queue.put(_DONE)
+
+    def write_stage():
+        while True:
+            entry = write_queue.get()
+            if entry is _DONE:
+                break
+            page, result = entry
+            try:
+                write(page, result)
+            except Exception as e:
+                fail(page, e)
+
+    reader_count = max(1, min(readers, len(pages)))
+    threads = start_threads(reader_count, read_stage)
+    threads += start_threads(max(1, writers), write_stage)
+
+    finished_readers = 0
+    while finished_readers < reader_count:
+        entry = read_queue.get()
+        if entry is _DONE:
+            finished_readers += 1
+            continue
+        page, data, error = entry
+        if error is None:
+            try:
+                write_queue.put((page, render(page, data)))
+                continue
+            except Exception as e:
+                error = e
+        fail(page, error)
+
+    for _ in range(max(1, writers)):
+        write_queue.put(_DONE)
+    for thread in threads:
+        thread.join()
+
+    if failures:
+        for source_path, message in failures:
+            print(f"Error generating {source_path}: {message}")
+        raise RenderError(failures)
+    return len(pages)
@@ -0,0 +1,100 @@
+import contextlib, csv, json, time
+
+PHASES = (
+    "read",
+    "extract_title",
+    "markdown_to_blocks",
+    "inline_parsing",
+    "to_html",
+    "template",
+    "write",
+)
+SLOWEST_PAGES = 20
+
+
+class NullTimer:
+    """Stand-in used when profiling is off; every phase is a shared no-op."""
+
+    _phase = contextlib.nullcontext()
+
+    def phase(self, name):
+        return self._phase
+
+
+NULL_TIMER = NullTimer()
+
+
+class PageTimer:
+    """Wall and CPU seconds spent in each phase of rendering one page."""
+
+    def __init__(self):
+        self.phases = {}
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        wall_start = time.perf_counter()
+        cpu_start = time.thread_time()
+        try:
+            yield
+        finally:
+            wall, cpu = self.phases.get(name, (0.0, 0.0))
+            self.phases[name] = (
+                wall + time.perf_counter() - wall_start,
+                cpu + time.thread_time() - cpu_start,
+            )
+
+
+class BuildProfile:
+    def __init__(self):
+        self.pages = {}
+
+    def add(self, source_path, phases):
+        self.pages[source_path] = phases
+
+    def totals(self):
+        totals = {name: [0.0, 0.0] for name in PHASES}
+        for phases in self.pages.values():
+            for name, (wall, cpu) in phases.items():
+                total = totals.setdefault(name, [0.0, 0.0])
+                total[0] += wall
+                total[1] += cpu
+        return {name: {"wall": wall, "cpu": cpu} for name, (wall, cpu) in totals.items()}
+
+    def slowest(self, count=SLOWEST_PAGES):
+        def page_wall(item):
+            return sum(wall for wall, _ in item[1].values())
+
+        ranked = sorted(self.pages.items(), key=page_wall, reverse=True)[:count]
+        return [
+            {
+                "page": source_path,
+                "wall": page_wall((source_path, phases)),
+                "phases": {name: {"wall": wall, "cpu": cpu} for name, (wall, cpu) in phases.items()},
+            }
+            for source_path, phases in ranked
+        ]
+
+    def write_report(self, path):
+        """Write the report as CSV (one row per page) when `path` ends in
+        .csv, otherwise as JSON with phase totals and the slowest pages."""
+        if path.endswith(".csv"):
+            with open(path, 'w', encoding='utf-8', newline='') as f:
+                writer = csv.writer(f)
+                writer.writerow(["page", "phase", "wall", "cpu"])
+                for source_path, phases in sorted(self.pages.items()):
+                    for name, (wall, cpu) in phases.items():
+                        writer.writerow([source_path, name, f"{wall:.6f}", f"{cpu:.6f}"])
+            return
+
+        report = {
+            "page_count": len(self.pages),
+            "phases": self.totals(),
+            "slowest_pages": self.slowest(),
+        }
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+
+    def print_summary(self):
+        print(f"Profiled {len(self.pages)} pages")
+        for name, total in self.totals().items():
+            print(f"  {name:<20} wall {total['wall'] * 1000:9.2f} ms  cpu {total['cpu'] * 1000:9.2f} ms")
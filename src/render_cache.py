@@ -0,0 +1,92 @@
+from collections import OrderedDict
+from jsonfile import load_json, save_json_atomic
+import hashlib
+
+MAX_ENTRIES = 50_000
+CACHE_VERSION = 1
+
+
+def block_key(block, context=""):
+    """Stable key for a block's rendered HTML. `context` covers whatever else
+    changes the output, such as the basepath links are resolved against."""
+    digest = hashlib.blake2b(context.encode('utf-8'), digest_size=16)
+    digest.update(b"\0")
+    digest.update(block.encode('utf-8'))
+    return digest.hexdigest()
+
+
+class BlockCache:
+    """Bounded LRU of rendered block HTML, optionally saved between builds."""
+
+    def __init__(self, max_entries=MAX_ENTRIES, path=None, track_new=False):
+        self.max_entries = max_entries
+        self.path = path
+        self.entries = OrderedDict()
+        # Pool workers record what they add so the parent can merge it.
+        self.new_entries = {} if track_new else None
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def load(cls, path, max_entries=MAX_ENTRIES, track_new=False):
+        cache = cls(max_entries, path, track_new)
+        data = load_json(path, CACHE_VERSION)
+        if data is not None:
+            # Saved oldest first, so the most recently used entries survive
+            # if max_entries has shrunk since.
+            for key, html in data["entries"]:
+                cache.entries[key] = html
+            while len(cache.entries) > max_entries:
+                cache.entries.popitem(last=False)
+        return cache
+
+    def save(self):
+        if not self.path:
+            return
+        save_json_atomic(self.path, {"version": CACHE_VERSION, "entries": list(self.entries.items())})
+
+    def get(self, key):
+        html = self.entries.get(key)
+        if html is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.entries.move_to_end(key)
+        return html
+
+    def put(self, key, html):
+        self.entries[key] = html
+        self.entries.move_to_end(key)
+        if self.new_entries is not None:
+            self.new_entries[key] = html
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def render(self, block, context, render_block):
+        """The cached HTML for a scanned Block, calling render_block(block)
+        to fill it on a miss."""
+        key = block_key(block.text, context)
+        html = self.get(key)
+        if html is None:
+            html = render_block(block)
+            self.put(key, html)
+        return html
+
+    def take_delta(self):
+        """New entries and hit/miss counts since the last call, for merging
+        a worker's cache back into the parent's."""
+        delta = (self.new_entries, self.hits, self.misses)
+        self.new_entries = {}
+        self.hits = self.misses = 0
+        return delta
+
+    def merge(self, entries, hits=0, misses=0):
+        for key, html in entries.items():
+            self.put(key, html)
+        self.hits += hits
+        self.misses += misses
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        rate = self.hits / lookups * 100 if lookups else 0.0
+        return f"Block cache: {self.hits} hits, {self.misses} misses ({rate:.1f}% hit rate), {len(self.entries)} entries"
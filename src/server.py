@@ -0,0 +1,150 @@
+from main import PROJECT_DIR, build, find_pages, generate_page, page_output_path, remove_empty_dirs
+from output import OutputWriter
+from render_cache import BlockCache
+from static_sync import copy_file
+import argparse, functools, http.server, os, threading, time
+
+WATCH_INTERVAL = 0.25
+
+
+def snapshot(path):
+    """Map every file at or under `path` to its (mtime_ns, size)."""
+    files = {}
+    if os.path.isfile(path):
+        stat = os.stat(path)
+        files[path] = (stat.st_mtime_ns, stat.st_size)
+        return files
+
+    for root, _, names in os.walk(path):
+        for name in names:
+            file_path = os.path.join(root, name)
+            try:
+                stat = os.stat(file_path)
+            except FileNotFoundError:
+                continue
+            files[file_path] = (stat.st_mtime_ns, stat.st_size)
+    return files
+
+
+def diff_snapshots(old, new):
+    changed = [path for path, signature in new.items() if old.get(path) != signature]
+    removed = [path for path in old if path not in new]
+    return changed, removed
+
+
+class SiteWatcher:
+    """Keeps a built site in sync with its sources from inside one process.
+
+    Each poll stats content/, static/ and template.html and re-renders only
+    the pages behind changed files, or every page when the template changes.
+    Rendered blocks stay in an in-memory cache, so a template edit re-renders
+    every page without re-parsing unchanged blocks.
+    """
+
+    def __init__(self, project_dir, public_dir, basepath="/"):
+        self.public_dir = public_dir
+        self.basepath = basepath
+        self.content_dir = os.path.join(project_dir, "content")
+        self.static_dir = os.path.join(project_dir, "static")
+        self.template_path = os.path.join(project_dir, "template.html")
+        self.cache = BlockCache()
+        self.snapshots = self.take_snapshot()
+
+    def take_snapshot(self):
+        files = snapshot(self.content_dir)
+        files.update(snapshot(self.static_dir))
+        files.update(snapshot(self.template_path))
+        return files
+
+    def poll(self):
+        snapshots = self.take_snapshot()
+        changed, removed = diff_snapshots(self.snapshots, snapshots)
+        self.snapshots = snapshots
+        if changed or removed:
+            self.rebuild(changed, removed)
+        return changed, removed
+
+    def watch(self, interval=WATCH_INTERVAL):
+        while True:
+            time.sleep(interval)
+            self.poll()
+
+    def rebuild(self, changed, removed):
+        start = time.perf_counter()
+
+        if self.template_path in changed:
+            pages = find_pages(self.content_dir, self.public_dir)
+        else:
+            pages = [(path, self.output_path(path)) for path in changed if self.is_content(path)]
+
+        for path in removed:
+            if path != self.template_path:
+                self.remove_output(self.output_path(path))
+
+        for path in changed:
+            if not self.is_content(path) and path != self.template_path:
+                dest_path = self.output_path(path)
+                os.makedirs(os.path.dirname(dest_path), exist_ok=True)
+                copy_file(path, dest_path)
+
+        failed = 0
+        writer = OutputWriter()
+        for source_path, dest_path in pages:
+            try:
+                generate_page(source_path, self.template_path, dest_path, self.basepath, cache=self.cache,
+                              writer=writer)
+            except Exception as e:
+                failed += 1
+                print(f"Error generating {source_path}: {e}")
+
+        elapsed = (time.perf_counter() - start) * 1000
+        print(f"Rebuilt {len(pages) - failed} pages ({writer.written} written, {writer.skipped} unchanged, "
+              f"{failed} failed, {len(removed)} removed) in {elapsed:.1f} ms")
+
+    def is_content(self, path):
+        return path.startswith(self.content_dir + os.sep)
+
+    def output_path(self, path):
+        if self.is_content(path):
+            return page_output_path(self.public_dir, os.path.relpath(path, self.content_dir))
+        return os.path.join(self.public_dir, os.path.relpath(path, self.static_dir))
+
+    def remove_output(self, output_path):
+        if os.path.isfile(output_path):
+            os.remove(output_path)
+            remove_empty_dirs(os.path.dirname(output_path), self.public_dir)
+
+
+def serve(project_dir, public_dir, basepath="/", port=8888, watch=False, interval=WATCH_INTERVAL):
+    build(project_dir, public_dir, basepath, incremental=True)
+
+    if watch:
+        watcher = SiteWatcher(project_dir, public_dir, basepath)
+        threading.Thread(target=watcher.watch, args=(interval,), daemon=True).start()
+        print(f"Watching {project_dir} for changes")
+
+    handler = functools.partial(http.server.SimpleHTTPRequestHandler, directory=public_dir)
+    with http.server.ThreadingHTTPServer(("", port), handler) as httpd:
+        print(f"Serving {public_dir} at http://localhost:{port}/")
+        try:
+            httpd.serve_forever()
+        except KeyboardInterrupt:
+            pass
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="main.py serve", description="Build and serve the site")
+    parser.add_argument("basepath", nargs="?", default="/")
+    parser.add_argument("--port", type=int, default=8888)
+    parser.add_argument("--watch", action="store_true",
+                        help="re-render changed pages while serving")
+    parser.add_argument("--interval", type=float, default=WATCH_INTERVAL,
+                        help="seconds between checks for changed files")
+    args = parser.parse_args(argv)
+
+    serve(PROJECT_DIR, os.path.join(PROJECT_DIR, "docs"), args.basepath,
+          port=args.port, watch=args.watch, interval=args.interval)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+from main import PROJECT_DIR, remove_empty_dirs
+from output import OUTPUT_MARKER, claim_output_root, list_outputs, read_marker
+from static_sync import sync_static
+import argparse, filecmp, hashlib, os
+
+
+class ShardConflictError(Exception):
+    def __init__(self, conflicts):
+        self.conflicts = conflicts
+        super().__init__(f"{len(conflicts)} output path(s) differ between shards")
+
+
+class IncompleteShardsError(Exception):
+    pass
+
+
+def parse_shard(spec):
+    """"2/4" -> (2, 4): the second of four shards, counted from 1."""
+    index, sep, count = spec.partition("/")
+    if not sep:
+        raise ValueError(f"Shard must look like i/N, got {spec!r}")
+    index, count = int(index), int(count)
+    if not 1 <= index <= count:
+        raise ValueError(f"Shard index must be between 1 and {count}, got {index}")
+    return index, count
+
+
+def shard_of(relative_path, count):
+    """The shard, counted from 1, that renders the page at `relative_path`
+    under content/. The path is hashed with "/" separators, so every machine
+    splits the site the same way whatever its OS or Python hash seed."""
+    digest = hashlib.blake2b(relative_path.replace(os.sep, "/").encode('utf-8'), digest_size=8).digest()
+    return int.from_bytes(digest, "big") % count + 1
+
+
+def select_shard(pages, content_dir, index, count):
+    """The (source_path, dest_path) pairs among `pages` that shard `index` of
+    `count` renders."""
+    return [(source_path, dest_path) for source_path, dest_path in pages
+            if shard_of(os.path.relpath(source_path, content_dir), count) == index]
+
+
+def check_shards(shard_dirs):
+    """Raise IncompleteShardsError unless `shard_dirs` are output roots of
+    shards 1 to N of one sharded build, each exactly once. Every shard build
+    records its i/N in the root's output marker."""
+    if not shard_dirs:
+        raise IncompleteShardsError("No shard directories given")
+    seen = {}
+    counts = set()
+    for shard_dir in shard_dirs:
+        if not os.path.isdir(shard_dir):
+            raise IncompleteShardsError(f"Shard directory {shard_dir} does not exist")
+        marker = read_marker(shard_dir)
+        if not marker or not marker.get("shard"):
+            raise IncompleteShardsError(f"{shard_dir} is not the output of a sharded build")
+        index, count = marker["shard"]
+        if index in seen:
+            raise IncompleteShardsError(f"{shard_dir} and {seen[index]} both hold shard {index}/{count}")
+        seen[index] = shard_dir
+        counts.add(count)
+    if len(counts) > 1:
+        raise IncompleteShardsError(f"Shards come from builds split {sorted(counts)} ways")
+    count = counts.pop()
+    missing = sorted(set(range(1, count + 1)) - set(seen))
+    if missing:
+        raise IncompleteShardsError(f"Missing shard(s) {', '.join(f'{index}/{count}' for index in missing)}")
+
+
+def find_conflicts(shard_dirs):
+    """Output paths present in more than one shard with different content,
+    as (relative_path, first shard dir, other shard dir). Static files are
+    written by every shard, so identical copies are not conflicts."""
+    owners = {}
+    conflicts = []
+    for shard_dir in shard_dirs:
+        for relative_path in list_outputs(shard_dir):
+            owner = owners.setdefault(relative_path, shard_dir)
+            if owner != shard_dir and not filecmp.cmp(os.path.join(owner, relative_path),
+                                                      os.path.join(shard_dir, relative_path), shallow=False):
+                conflicts.append((relative_path, owner, shard_dir))
+    return conflicts, owners
+
+
+def merge_shards(shard_dirs, public_dir, link=False, known_root=False):
+    """Combine the output roots of a sharded build into `public_dir`.
+
+    Nothing is written unless every shard of the build is present and no
+    output path conflicts between them. Files are synced like static files,
+    so unchanged ones are skipped. Anything in `public_dir` that no shard
+    produced is removed, provided the generator owns it (see
+    output.claim_output_root). Returns the number of files in the merged
+    site.
+    """
+    check_shards(shard_dirs)
+    conflicts, owners = find_conflicts(shard_dirs)
+    if conflicts:
+        for relative_path, owner, shard_dir in conflicts:
+            print(f"Conflict: {relative_path} differs between {owner} and {shard_dir}")
+        raise ShardConflictError(conflicts)
+
+    owned = claim_output_root(public_dir, known_root=known_root)
+    os.makedirs(public_dir, exist_ok=True)
+    for shard_dir in shard_dirs:
+        sync_static(shard_dir, public_dir, link=link, ignore={OUTPUT_MARKER})
+
+    if owned:
+        for relative_path in list_outputs(public_dir):
+            if relative_path not in owners:
+                output_path = os.path.join(public_dir, relative_path)
+                print(f"Removing stale output {output_path}")
+                os.remove(output_path)
+                remove_empty_dirs(os.path.dirname(output_path), public_dir)
+    else:
+        print(f"Not pruning unknown files in {public_dir}: it was not created by this generator")
+
+    print(f"Merged {len(owners)} files from {len(shard_dirs)} shards into {public_dir}")
+    return len(owners)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="main.py merge",
+                                     description="Combine the output roots of a sharded build")
+    parser.add_argument("shard_dirs", nargs="+", metavar="SHARD_DIR")
+    parser.add_argument("--output", help="directory to merge into (default docs/)")
+    parser.add_argument("--link", action="store_true",
+                        help="hardlink files into the output instead of copying them")
+    args = parser.parse_args(argv)
+
+    public_dir = args.output or os.path.join(PROJECT_DIR, "docs")
+    try:
+        merge_shards(args.shard_dirs, public_dir, link=args.link, known_root=not args.output)
+    except (ShardConflictError, IncompleteShardsError) as e:
+        raise SystemExit(f"Merge failed: {e}")
+
+
+if __name__ == "__main__":
+    main()
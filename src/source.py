@@ -0,0 +1,82 @@
+from patterns import FRONT_MATTER_FENCE_PATTERN, TITLE_PATTERN
+import contextlib, mmap, os
+
+# Files at least this big are memory-mapped; smaller ones are cheaper to read
+# in one call than to map.
+MMAP_THRESHOLD = 1 << 20
+# The scanner is fed lines decoded from chunks of about this many bytes, cut
+# at a newline so no line is split across two chunks.
+DECODE_CHUNK_SIZE = 1 << 16
+
+
+@contextlib.contextmanager
+def open_source(path):
+    """A read-only bytes view of the file at `path`: a memory map for large
+    files, otherwise its contents. The view is only valid inside the block."""
+    with open(path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        # An empty file cannot be mapped.
+        if size < MMAP_THRESHOLD or size == 0:
+            yield f.read()
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as view:
+            yield view
+
+
+def iter_lines(view, start=0):
+    """Yield the lines of `view` from byte offset `start` on as text, without
+    their newlines. Each byte is decoded once, a chunk at a time."""
+    end = len(view)
+    while start < end:
+        chunk_end = view.find(b"\n", min(start + DECODE_CHUNK_SIZE, end) - 1)
+        chunk_end = end if chunk_end == -1 else chunk_end + 1
+        text = view[start:chunk_end].decode('utf-8')
+        if "\r" in text:
+            text = text.replace("\r\n", "\n")
+        lines = text.split("\n")
+        if text.endswith("\n"):
+            lines.pop()
+        yield from lines
+        start = chunk_end
+
+
+def read_front_matter(view):
+    """Parse an optional `---` fenced block of `key: value` lines off the top
+    of a page. Returns (values, offset of the body). Keys are lowercased so
+    they line up with template placeholders.
+
+    A page that merely opens with a `---` rule is not front matter: if the
+    block is never closed or holds a line that is not `key: value`, the
+    whole page is the body."""
+    fence = FRONT_MATTER_FENCE_PATTERN.match(view)
+    if not fence:
+        return {}, 0
+
+    values = {}
+    offset = fence.end()
+    while offset < len(view):
+        line_end = view.find(b"\n", offset)
+        if line_end == -1:
+            line_end = len(view)
+        line = view[offset:line_end].decode('utf-8').rstrip("\r")
+        offset = line_end + 1
+        if line.rstrip(" \t") == "---":
+            return values, min(offset, len(view))
+        if not line.strip():
+            continue
+        key, sep, value = line.partition(":")
+        if not sep:
+            return {}, 0
+        values[key.strip().lower()] = value.strip()
+    return {}, 0
+
+
+def find_title(view, start=0):
+    """The first h1 in `view` at or after byte offset `start`. The search runs
+    over the view in place and stops at the first match."""
+    for title_match in TITLE_PATTERN.finditer(view, start):
+        title = title_match.group(1).decode('utf-8').strip()
+        if title:
+            return title
+
+    raise Exception("No h1 header found in markdown content")
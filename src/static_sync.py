@@ -0,0 +1,137 @@
+from manifest import hash_file
+import os, shutil
+
+COPY_WORKERS = 8
+# Linux ioctl to share a file's extents with another (btrfs, xfs, ...).
+FICLONE = 0x40049409
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+
+def list_files(directory):
+    """Relative paths of every file under `directory`, sorted."""
+    files = []
+    for root, _, names in os.walk(directory):
+        for name in names:
+            files.append(os.path.relpath(os.path.join(root, name), directory))
+    return sorted(files)
+
+
+def needs_copy(src_path, dest_path, checksum=False):
+    try:
+        dest_stat = os.stat(dest_path)
+    except FileNotFoundError:
+        return True
+    src_stat = os.stat(src_path)
+    if src_stat.st_size != dest_stat.st_size:
+        return True
+    if checksum:
+        return hash_file(src_path) != hash_file(dest_path)
+    return src_stat.st_mtime_ns != dest_stat.st_mtime_ns
+
+
+def clone_file(src, dest):
+    if fcntl is None:
+        return False
+    try:
+        fcntl.ioctl(dest.fileno(), FICLONE, src.fileno())
+        return True
+    except OSError:
+        return False
+
+
+def copy_file_range(src, dest):
+    if not hasattr(os, "copy_file_range"):
+        return False
+    remaining = os.fstat(src.fileno()).st_size
+    try:
+        while remaining > 0:
+            copied = os.copy_file_range(src.fileno(), dest.fileno(), remaining)
+            if copied == 0:
+                break
+            remaining -= copied
+    except OSError:
+        # Not supported for this pair of files; the caller falls back to a
+        # plain copy from wherever the file offsets have got to.
+        return False
+    return remaining == 0
+
+
+def copy_file(src_path, dest_path, link=False):
+    """Copy `src_path` over `dest_path` atomically, keeping its mtime.
+
+    With `link` a hardlink is tried first. Otherwise the data is reflinked or
+    copied in-kernel where the filesystem allows it, then copied normally.
+    The temp file plus rename never truncates an existing hardlinked output.
+    """
+    tmp_path = f"{dest_path}.{os.getpid()}.tmp"
+    try:
+        if link:
+            try:
+                os.link(src_path, tmp_path)
+                os.replace(tmp_path, dest_path)
+                return
+            except OSError:
+                pass
+
+        with open(src_path, 'rb') as src, open(tmp_path, 'wb') as dest:
+            if not clone_file(src, dest) and not copy_file_range(src, dest):
+                shutil.copyfileobj(src, dest)
+        shutil.copystat(src_path, tmp_path)
+        os.replace(tmp_path, dest_path)
+    finally:
+        if os.path.lexists(tmp_path):
+            os.remove(tmp_path)
+
+
+def sync_static(static_dir, public_dir, link=False, checksum=False, workers=COPY_WORKERS, compressor=None,
+                assets=None, ignore=()):
+    """Bring `public_dir` up to date with `static_dir`, copying only changed
+    files across a thread pool. Returns (all output files, copied files) as
+    paths relative to `public_dir`. Removing outputs is left to the caller,
+    which knows what the previous build wrote. Every synced file is
+    submitted to a `compressor`, if given, along with whether it was copied.
+
+    With an AssetManifest as `assets`, each fingerprintable file is also
+    written under its fingerprinted name. The plain name is kept for
+    references that are not rewritten, such as url() inside stylesheets.
+    Relative paths in `ignore` are not synced.
+    """
+    if not os.path.exists(static_dir):
+        print("No static directory found, skipping static file copying")
+        return [], []
+
+    sources = {relative_path: relative_path for relative_path in list_files(static_dir)
+               if relative_path not in ignore}
+    if assets is not None:
+        fingerprinted = assets.update(static_dir, sorted(sources))
+        sources.update({output_path: source_path for source_path, output_path in fingerprinted.items()})
+    files = sorted(sources)
+    to_copy = [
+        relative_path for relative_path in files
+        if needs_copy(os.path.join(static_dir, sources[relative_path]), os.path.join(public_dir, relative_path),
+                      checksum)
+    ]
+
+    for directory in {os.path.dirname(relative_path) for relative_path in to_copy}:
+        os.makedirs(os.path.join(public_dir, directory), exist_ok=True)
+
+    def copy(relative_path):
+        copy_file(os.path.join(static_dir, sources[relative_path]), os.path.join(public_dir, relative_path), link)
+
+    if to_copy:
+        from concurrent.futures import ThreadPoolExecutor
+
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            list(pool.map(copy, to_copy))
+
+    if compressor is not None:
+        copied = set(to_copy)
+        for relative_path in files:
+            compressor.submit(os.path.join(public_dir, relative_path), changed=relative_path in copied)
+
+    print(f"Static files synced from {static_dir}: {len(to_copy)} copied, {len(files) - len(to_copy)} unchanged")
+    return files, to_copy
@@ -0,0 +1,76 @@
+import os, re
+
+PLACEHOLDER_PATTERN = re.compile(r"\{\{\s*([A-Za-z_]\w*)\s*\}\}")
+URL_ATTRIBUTE_PATTERN = re.compile(r'\b(href|src)="([^"]*)"')
+
+_cache = {}
+
+
+class Template:
+    """A template parsed once into literal text and named placeholders.
+
+    Placeholder names are case-insensitive, so `{{ Title }}` and `{{ title }}`
+    both read the "title" value. Placeholders without a value are left in the
+    output untouched.
+    """
+
+    def __init__(self, source):
+        self.literals = []
+        self.names = []
+        self.placeholders = []
+        pos = 0
+        for match in PLACEHOLDER_PATTERN.finditer(source):
+            self.literals.append(source[pos:match.start()])
+            self.names.append(match.group(1).lower())
+            self.placeholders.append(match.group())
+            pos = match.end()
+        self.literals.append(source[pos:])
+
+    def iter_render(self, values):
+        """Yield the page in order. String values are written as-is; any other
+        value is treated as a node and streamed through its `iter_html()`."""
+        for literal, name, placeholder in zip(self.literals, self.names, self.placeholders):
+            yield literal
+            value = values.get(name)
+            if value is None:
+                yield placeholder
+            elif isinstance(value, str):
+                yield value
+            else:
+                yield from value.iter_html()
+        yield self.literals[-1]
+
+    def render(self, values):
+        return "".join(self.iter_render(values))
+
+    def resolve_urls(self, resolve_url):
+        """Return a copy with `href`/`src` attributes in the literal text passed
+        through `resolve_url`. Placeholder values are not touched."""
+        def resolve(match):
+            return f'{match.group(1)}="{resolve_url(match.group(2))}"'
+
+        resolved = Template.__new__(Template)
+        resolved.literals = [URL_ATTRIBUTE_PATTERN.sub(resolve, literal) for literal in self.literals]
+        resolved.names = self.names
+        resolved.placeholders = self.placeholders
+        return resolved
+
+
+def load_template(path, resolve_url=None):
+    """Compiled template for `path`, with its own URLs already resolved.
+
+    Cached by path and resolver, and re-read only when the file's mtime or
+    size changes.
+    """
+    stat = os.stat(path)
+    key = (stat.st_mtime_ns, stat.st_size)
+    cached = _cache.get((path, resolve_url))
+    if cached and cached[0] == key:
+        return cached[1]
+
+    with open(path, 'r', encoding='utf-8') as f:
+        template = Template(f.read())
+    if resolve_url:
+        template = template.resolve_urls(resolve_url)
+    _cache[(path, resolve_url)] = (key, template)
+    return template
@@ -0,0 +1,95 @@
+import contextlib
+import io
+import os
+import random
+import tempfile
+import unittest
+
+from benchmark import import_times, measure_startup, measure_tree_memory, print_memory, print_results, print_startup, run_benchmarks
+from corpus import SHAPES, generate_corpus, make_page, page_shape
+from main import build
+from markdown_to_html import markdown_to_html_node
+from testutil import write_file
+
+
+class TestCorpus(unittest.TestCase):
+    def test_every_shape_renders(self):
+        for shape in SHAPES:
+            if shape == "mixed":
+                continue
+            page = make_page(random.Random(0), shape, 1)
+            self.assertTrue(page.startswith("# "))
+            self.assertTrue(markdown_to_html_node(page).to_html().startswith("<div><h1>"))
+
+    def test_generation_is_deterministic(self):
+        with tempfile.TemporaryDirectory() as first, tempfile.TemporaryDirectory() as second:
+            self.assertEqual(generate_corpus(first, 12, "small", seed=3), generate_corpus(second, 12, "small", seed=3))
+            with open(os.path.join(first, "blog", "post0", "5", "index.md"), encoding='utf-8') as a, \
+                    open(os.path.join(second, "blog", "post0", "5", "index.md"), encoding='utf-8') as b:
+                self.assertEqual(a.read(), b.read())
+
+    def test_mixed_shape(self):
+        shapes = [page_shape("mixed", index) for index in range(100)]
+        self.assertEqual(shapes.count("huge"), 1)
+        self.assertEqual(shapes.count("links"), 10)
+        self.assertEqual(shapes.count("nested"), 10)
+
+
+class TestRunBenchmarks(unittest.TestCase):
+    def test_results(self):
+        results = run_benchmarks(pages=3, shape="small", repeat=1, list_items=20)
+        self.assertEqual(list(results), ["text_to_nodes", "markdown_to_html_node", "to_html", "ordered_list", "build"])
+        for result in results.values():
+            self.assertGreater(result["seconds"], 0)
+            self.assertGreater(result["pages_per_second"], 0)
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            print_results(results, baseline=results)
+        lines = output.getvalue().splitlines()
+        self.assertEqual([line.split()[0] for line in lines[1:]], list(results))
+        self.assertTrue(all(line.endswith("1.00x") for line in lines[1:]))
+
+    def test_tree_memory(self):
+        memory = measure_tree_memory(pages=3, shape="small")
+        self.assertGreater(memory["retained_bytes_per_page"], 0)
+        self.assertGreaterEqual(memory["peak_bytes_per_page"], memory["retained_bytes_per_page"])
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            print_memory(memory, baseline=memory)
+        lines = output.getvalue().splitlines()
+        self.assertEqual([line.split()[0] for line in lines], list(memory))
+        self.assertTrue(all(line.endswith("1.00x") for line in lines))
+
+
+class TestStartup(unittest.TestCase):
+    RENDERER = {"markdown_to_html", "markdown_to_blocks", "markdown_to_nodes", "htmlnode", "template",
+                "concurrent.futures"}
+
+    def test_cli_import_skips_renderer(self):
+        self.assertFalse(self.RENDERER & set(import_times()))
+
+    def test_noop_build_skips_renderer(self):
+        with tempfile.TemporaryDirectory() as project_dir:
+            public_dir = os.path.join(project_dir, "docs")
+            write_file(os.path.join(project_dir, "template.html"), "<title>{{ Title }}</title>{{ Content }}")
+            write_file(os.path.join(project_dir, "content", "index.md"), "# Home")
+            with contextlib.redirect_stdout(io.StringIO()):
+                build(project_dir, public_dir, incremental=True)
+
+            code = ("import contextlib, io, main\n"
+                    "with contextlib.redirect_stdout(io.StringIO()):\n"
+                    f"    main.build({project_dir!r}, {public_dir!r}, incremental=True)")
+            self.assertFalse(self.RENDERER & set(import_times(code)))
+
+    def test_measure_startup(self):
+        startup = measure_startup(repeat=1)
+        self.assertGreater(startup["import_main_ms"], 0)
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            print_startup(startup, baseline=startup)
+        self.assertTrue(output.getvalue().startswith("import main"))
+        self.assertIn("1.00x", output.getvalue().splitlines()[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
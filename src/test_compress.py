@@ -0,0 +1,128 @@
+import gzip
+import os
+import tempfile
+import unittest
+
+from compress import Compressor, compress_file, compressed_path
+from testutil import ProjectTestCase, write_file
+
+
+def read_gzip(path):
+    with gzip.open(compressed_path(path), 'rt', encoding='utf-8') as f:
+        return f.read()
+
+
+def sibling_inode(path):
+    # compress_file replaces the sibling, so an unchanged inode means the
+    # file was not compressed again.
+    return os.stat(compressed_path(path)).st_ino
+
+
+class TestCompressor(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.page = os.path.join(self.tmp.name, "page.html")
+        write_file(self.page, "<p>hello</p>" * 100)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_compress_file_is_deterministic(self):
+        compress_file(self.page)
+        with open(compressed_path(self.page), 'rb') as f:
+            first = f.read()
+        os.utime(self.page, ns=(10**18, 10**18))
+        compress_file(self.page)
+        with open(compressed_path(self.page), 'rb') as f:
+            self.assertEqual(f.read(), first)
+        self.assertEqual(read_gzip(self.page), "<p>hello</p>" * 100)
+        self.assertEqual(os.stat(compressed_path(self.page)).st_mtime_ns, 10**18)
+
+    def test_unchanged_file_with_sibling_is_skipped(self):
+        compressor = Compressor(workers=2)
+        compressor.submit(self.page)
+        compressor.close()
+        inode = sibling_inode(self.page)
+
+        compressor = Compressor(workers=2)
+        compressor.submit(self.page, changed=False)
+        compressor.close()
+        self.assertEqual(sibling_inode(self.page), inode)
+        self.assertEqual((compressor.compressed, compressor.skipped), (0, 1))
+
+    def test_stale_sibling_is_recompressed(self):
+        compress_file(self.page)
+        write_file(self.page, "<p>rewritten</p>")
+        os.utime(self.page, ns=(10**18, 10**18))
+        compressor = Compressor()
+        compressor.submit(self.page, changed=False)
+        compressor.close()
+        self.assertEqual(read_gzip(self.page), "<p>rewritten</p>")
+        self.assertEqual((compressor.compressed, compressor.skipped), (1, 0))
+
+    def test_unchanged_file_without_sibling_is_compressed(self):
+        compressor = Compressor()
+        compressor.submit(self.page, changed=False)
+        compressor.close()
+        self.assertTrue(os.path.exists(compressed_path(self.page)))
+
+    def test_incompressible_files_are_ignored(self):
+        image = os.path.join(self.tmp.name, "a.png")
+        write_file(image, "not really a png")
+        compressor = Compressor()
+        compressor.submit(image)
+        compressor.close()
+        self.assertFalse(os.path.exists(compressed_path(image)))
+
+
+class TestBuildCompression(ProjectTestCase):
+    FILES = {
+        "static/index.css": "body {}",
+        "static/a.png": "png",
+        "content/index.md": "# Home\n\nWelcome",
+        "content/blog/index.md": "# Blog\n\nPosts",
+    }
+
+    def test_siblings_for_pages_and_text_assets(self):
+        self.build(compress=True)
+        self.assertIn("<p>Welcome</p>", read_gzip(self.output("index.html")))
+        self.assertEqual(read_gzip(self.output("index.css")), "body {}")
+        self.assertTrue(os.path.exists(compressed_path(self.output("blog", "index.html"))))
+        self.assertFalse(os.path.exists(compressed_path(self.output("a.png"))))
+
+    def test_only_changed_pages_are_recompressed(self):
+        for jobs in (1, 2):
+            self.build(compress=True, jobs=jobs)
+            inodes = [sibling_inode(self.output("index.html")), sibling_inode(self.output("index.css"))]
+            write_file(self.path("content", "blog", "index.md"), f"# Blog\n\nEdit {jobs}")
+            self.build(compress=True, jobs=jobs)
+
+            self.assertEqual([sibling_inode(self.output("index.html")), sibling_inode(self.output("index.css"))],
+                             inodes)
+            self.assertIn(f"Edit {jobs}", read_gzip(self.output("blog", "index.html")))
+
+    def test_removed_page_removes_sibling(self):
+        self.build(compress=True)
+        os.remove(self.path("content", "blog", "index.md"))
+        self.build(incremental=True, compress=True)
+        self.assertFalse(os.path.exists(self.output("blog")))
+
+    def test_siblings_catch_up_after_builds_without_compression(self):
+        self.build(compress=True, fingerprint=True)
+        self.build(incremental=True)
+        write_file(self.path("content", "blog", "index.md"), "# Blog\n\nEdited")
+        self.build(incremental=True)
+        self.build(incremental=True, compress=True)
+        for name in ["index.html", os.path.join("blog", "index.html"), "index.css"]:
+            with open(self.output(name), encoding='utf-8') as f:
+                self.assertEqual(read_gzip(self.output(name)), f.read(), name)
+
+    def test_full_build_without_compression_removes_siblings(self):
+        self.build(compress=True)
+        self.build()
+        self.assertFalse(os.path.exists(compressed_path(self.output("index.html"))))
+        self.assertFalse(os.path.exists(compressed_path(self.output("index.css"))))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,122 @@
+import os
+import unittest
+
+from dependencies import DependencyGraph, explain_lines, local_target, page_links
+from manifest import Manifest
+from testutil import ProjectTestCase, write_file
+
+
+class TestLocalTarget(unittest.TestCase):
+    def test_absolute_path(self):
+        self.assertEqual(local_target("/images/a.png"), "/images/a.png")
+
+    def test_relative_path_resolves_against_page(self):
+        self.assertEqual(local_target("a.png", "/blog/tom"), "/blog/tom/a.png")
+        self.assertEqual(local_target("../majesty", "/blog/tom"), "/blog/majesty")
+
+    def test_query_and_fragment_are_dropped(self):
+        self.assertEqual(local_target("/contact?x=1#form"), "/contact")
+
+    def test_percent_escapes_are_decoded(self):
+        self.assertEqual(local_target("/images/my%20pic.png"), "/images/my pic.png")
+
+    def test_external_urls_are_ignored(self):
+        for url in ["https://example.com/a.png", "//cdn.example.com/a.png", "mailto:a@b.c", "#top", ""]:
+            self.assertIsNone(local_target(url), url)
+
+    def test_page_links_uses_output_directory(self):
+        output = os.path.join("blog", "tom", "index.html")
+        self.assertEqual(page_links(["tom.png", "/", "/", "https://x.org"], output), ["/", "/blog/tom/tom.png"])
+
+
+class TestDependencyGraph(unittest.TestCase):
+    def setUp(self):
+        self.entries = {
+            "a.md": {"output": "a.html", "links": ["/images/x.png", "/b"]},
+            "b.md": {"output": "b.html", "links": ["/images/x.png"]},
+            "c.md": {"output": "c.html"},
+        }
+
+    def test_dependents(self):
+        graph = DependencyGraph(self.entries)
+        self.assertEqual(graph.dependents("/images/x.png"), ["a.md", "b.md"])
+        self.assertEqual(graph.dependents("/images/y.png"), [])
+
+    def test_dependencies(self):
+        graph = DependencyGraph(self.entries)
+        self.assertEqual(graph.dependencies("a.md"), ["a.md", "template.html", "basepath", "/images/x.png", "/b"])
+
+    def test_explain_rebuilt_pages(self):
+        lines = explain_lines("", self.entries, {"b.md": "source changed"})
+        self.assertEqual(lines, [
+            "b.md -> b.html",
+            "  rebuilt: source changed",
+            "  depends on: b.md, template.html, basepath, /images/x.png",
+        ])
+
+    def test_explain_one_page(self):
+        lines = explain_lines(os.path.join("content", "c.md"), self.entries, {"b.md": "source changed"})
+        self.assertEqual(lines[:2], ["c.md -> c.html", "  up to date"])
+        self.assertEqual(explain_lines("a.html", self.entries, {})[0], "a.md -> a.html")
+        self.assertEqual(explain_lines("d.md", self.entries, {}), ["No page matches d.md"])
+
+
+class TestAssetInvalidation(ProjectTestCase):
+    FILES = {
+        "static/images/a.png": "a",
+        "static/images/b.png": "b",
+        "content/index.md": "# Home\n\n![A](/images/a.png)",
+        "content/blog/index.md": "# Blog\n\n![B](../images/b.png)",
+        "content/code.md": "# Code\n\n```\n![A](/images/a.png)\n```",
+    }
+
+    def plan(self, changed_assets):
+        manifest = Manifest.load(self.manifest_path)
+        content_dir = os.path.join(self.project_dir, "content")
+        pages = [(os.path.join(content_dir, key), os.path.join(self.public_dir, entry["output"]))
+                 for key, entry in manifest.pages.items()]
+        return manifest.plan(pages, content_dir, self.public_dir, manifest.template_hash, manifest.basepath,
+                             changed_assets=changed_assets)
+
+    def test_links_are_recorded(self):
+        self.build()
+        pages = Manifest.load(self.manifest_path).pages
+        self.assertEqual(pages["index.md"]["links"], ["/images/a.png"])
+        self.assertEqual(pages[os.path.join("blog", "index.md")]["links"], ["/images/b.png"])
+        self.assertEqual(pages["code.md"]["links"], [])
+
+    def test_changed_asset_invalidates_linking_pages(self):
+        self.build()
+        to_render, _, _, reasons = self.plan({"/images/a.png"})
+        self.assertEqual(to_render, [(self.path("content", "index.md"), self.output("index.html"))])
+        self.assertEqual(reasons, {"index.md": "linked asset /images/a.png changed"})
+
+    def test_asset_edit_rebuilds_only_linking_page(self):
+        self.build()
+        write_file(self.path("static", "images", "b.png"), "bigger b")
+        output = self.build(incremental=True, explain="")
+
+        self.assertIn("Rendered 1 of 3 pages", output)
+        self.assertIn(f"{os.path.join('blog', 'index.md')} -> {os.path.join('blog', 'index.html')}\n"
+                      "  rebuilt: linked asset /images/b.png changed", output)
+
+    def test_removed_asset_rebuilds_linking_page(self):
+        self.build()
+        os.remove(self.path("static", "images", "a.png"))
+        self.assertIn("Rendered 1 of 3 pages", self.build(incremental=True))
+
+    def test_links_survive_parallel_and_pipelined_builds(self):
+        self.build(jobs=2)
+        self.assertEqual(Manifest.load(self.manifest_path).pages["index.md"]["links"], ["/images/a.png"])
+        os.remove(self.manifest_path)
+        self.build(queue_depth=2)
+        self.assertEqual(Manifest.load(self.manifest_path).pages["index.md"]["links"], ["/images/a.png"])
+
+    def test_explain_noop_build(self):
+        self.build()
+        output = self.build(incremental=True, explain="index.md")
+        self.assertIn("index.md -> index.html\n  up to date\n", output)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,23 @@
+import unittest
+
+from main import extract_title
+
+
+class TestExtractTitle(unittest.TestCase):
+    def test_first_h1(self):
+        self.assertEqual(extract_title("intro\n\n# Hello  \n\n# Second"), "Hello")
+
+    def test_skips_other_headings_and_empty_titles(self):
+        self.assertEqual(extract_title("## Sub\n#NoSpace\n#   \n#\tTabbed title"), "Tabbed title")
+
+    def test_does_not_join_lines(self):
+        with self.assertRaises(Exception):
+            extract_title("# \nNot a title")
+
+    def test_missing_title(self):
+        with self.assertRaises(Exception):
+            extract_title("no heading here")
+
+
+if __name__ == "__main__":
+    unittest.main()
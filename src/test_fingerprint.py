@@ -0,0 +1,121 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import fingerprint
+from fingerprint import AssetManifest, fingerprinted_path
+from manifest import hash_file
+from testutil import ProjectTestCase, read_file, write_file
+
+class TestAssetManifest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.static_dir = os.path.join(self.tmp.name, "static")
+        write_file(os.path.join(self.static_dir, "index.css"), "body {}")
+        write_file(os.path.join(self.static_dir, "robots.txt"), "User-agent: *")
+        self.path = os.path.join(self.tmp.name, "assets.json")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_fingerprinted_path(self):
+        self.assertEqual(fingerprinted_path(os.path.join("css", "site.min.css"), "3fa9c1d2beef"),
+                         os.path.join("css", "site.min.3fa9c1d2.css"))
+
+    def test_only_assets_are_fingerprinted(self):
+        outputs = AssetManifest(self.path).update(self.static_dir, ["index.css", "robots.txt"])
+        digest = hash_file(os.path.join(self.static_dir, "index.css"))
+        self.assertEqual(outputs, {"index.css": f"index.{digest[:8]}.css"})
+
+    def test_unchanged_assets_are_not_rehashed(self):
+        assets = AssetManifest(self.path)
+        assets.update(self.static_dir, ["index.css"])
+        assets.save()
+
+        assets = AssetManifest.load(self.path)
+        with mock.patch.object(fingerprint, "hash_file", wraps=hash_file) as hashed:
+            assets.update(self.static_dir, ["index.css"])
+            self.assertEqual(hashed.call_count, 0)
+            write_file(os.path.join(self.static_dir, "index.css"), "body { color: red }")
+            outputs = assets.update(self.static_dir, ["index.css"])
+            self.assertEqual(hashed.call_count, 1)
+        digest = hash_file(os.path.join(self.static_dir, "index.css"))
+        self.assertEqual(outputs["index.css"], f"index.{digest[:8]}.css")
+
+    def test_removed_assets_are_forgotten(self):
+        assets = AssetManifest(self.path)
+        assets.update(self.static_dir, ["index.css"])
+        assets.update(self.static_dir, [])
+        self.assertEqual(assets.urls(), ())
+
+
+class TestFingerprintBuild(ProjectTestCase):
+    TEMPLATE = '<html><link href="/index.css" rel="stylesheet"><title>{{ Title }}</title>{{ Content }}</html>'
+    FILES = {
+        "static/index.css": "body {}",
+        "static/images/a.png": "a",
+        "content/index.md": "# Home\n\n![A](/images/a.png)",
+        "content/other.md": "# Other\n\n[Home](/)",
+    }
+
+    def build(self, **kwargs):
+        return super().build(fingerprint=True, **kwargs)
+
+    def asset_name(self, *parts):
+        relative_path = os.path.join(*parts)
+        return fingerprinted_path(relative_path, hash_file(self.path("static", relative_path)))
+
+    def page(self, name):
+        return read_file(self.output(name))
+
+    def test_references_are_rewritten(self):
+        self.build(basepath="/site/")
+        css = self.asset_name("index.css")
+        image = self.asset_name("images", "a.png").replace(os.sep, "/")
+        html = self.page("index.html")
+        self.assertIn(f'href="/site/{css}"', html)
+        self.assertIn(f'src="/site/{image}"', html)
+        self.assertTrue(os.path.exists(self.output(css)))
+        self.assertTrue(os.path.exists(self.output("index.css")))
+        self.assertTrue(os.path.exists(self.path("cache", "assets.json")))
+
+    def test_unchanged_assets_make_a_noop_build(self):
+        self.build()
+        output = self.build(incremental=True)
+        self.assertIn("0 hashed", output)
+        self.assertIn("Rendered 0 of 2 pages", output)
+
+    def test_changed_image_rebuilds_linking_page_only(self):
+        self.build()
+        old_image = self.asset_name("images", "a.png")
+        write_file(self.path("static", "images", "a.png"), "new image")
+        self.assertIn("Rendered 1 of 2 pages", self.build(incremental=True))
+
+        new_image = self.asset_name("images", "a.png")
+        self.assertIn(new_image.replace(os.sep, "/"), self.page("index.html"))
+        self.assertFalse(os.path.exists(self.output(old_image)))
+
+    def test_changed_template_asset_rebuilds_every_page(self):
+        self.build()
+        write_file(self.path("static", "index.css"), "body { color: red }")
+        self.assertIn("Rendered 2 of 2 pages", self.build(incremental=True))
+        self.assertIn(self.asset_name("index.css"), self.page("other.html"))
+
+    def test_explain_names_changed_template_asset(self):
+        self.build()
+        write_file(self.path("static", "index.css"), "body { color: red }")
+        output = self.build(incremental=True, explain="other.md")
+        self.assertIn("rebuilt: template asset /index.css changed", output)
+        write_file(self.path("template.html"), self.TEMPLATE + "\n")
+        self.assertIn("rebuilt: template changed", self.build(incremental=True, explain="other.md"))
+
+    def test_block_cache_sees_new_fingerprints(self):
+        self.build(block_cache=True)
+        write_file(self.path("static", "images", "a.png"), "new image")
+        self.build(block_cache=True)
+        self.assertIn(self.asset_name("images", "a.png").replace(os.sep, "/"), self.page("index.html"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,3 +1,4 @@
+import io
 import unittest
 
 from htmlnode import HTMLNode, LeafNode, ParentNode
@@ -115,5 +116,38 @@ class TestParentNode(unittest.TestCase):
         html = parent.to_html()
         self.assertIn('<div id="container" class="wrapper">', html)
         self.assertTrue(html.endswith("</div>"))
+
+    def test_nodes_have_no_instance_dict(self):
+        for node in [HTMLNode(), LeafNode("b", "x"), ParentNode("p", [LeafNode(None, "x")])]:
+            self.assertFalse(hasattr(node, "__dict__"))
+
+    def test_leaves_share_read_only_empties(self):
+        first = LeafNode("b", "one")
+        second = LeafNode("i", "two")
+        self.assertIs(first.children, second.children)
+        self.assertIs(first.props, second.props)
+        with self.assertRaises(TypeError):
+            first.children.append(second)
+        with self.assertRaises(TypeError):
+            first.props["class"] = "x"
+
+    def test_iter_html_fragments(self):
+        node = ParentNode("div", [ParentNode("p", [LeafNode("b", "bold"), LeafNode(None, " text")])])
+        self.assertEqual(
+            list(node.iter_html()),
+            ["<div>", "<p>", "<b>bold</b>", " text", "</p>", "</div>"],
+        )
+        self.assertEqual("".join(node.iter_html()), node.to_html())
+
+    def test_write_to(self):
+        node = ParentNode("ul", [ParentNode("li", [LeafNode("a", "home", {"href": "/"})])])
+        buffer = io.StringIO()
+        node.write_to(buffer)
+        self.assertEqual(buffer.getvalue(), '<ul><li><a href="/">home</a></li></ul>')
+
+    def test_iter_html_raises_for_invalid_child(self):
+        node = ParentNode("div", [ParentNode("p", [])])
+        with self.assertRaises(ValueError):
+            list(node.iter_html())
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
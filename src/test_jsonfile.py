@@ -0,0 +1,32 @@
+import os
+import tempfile
+import unittest
+
+from jsonfile import load_json, save_json_atomic
+from testutil import write_file
+
+
+class TestJsonFile(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "cache", "data.json")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_round_trip(self):
+        save_json_atomic(self.path, {"version": 3, "pages": {"a.md": 1}})
+        self.assertEqual(load_json(self.path, 3), {"version": 3, "pages": {"a.md": 1}})
+        self.assertEqual(os.listdir(os.path.dirname(self.path)), ["data.json"])
+
+    def test_unusable_files_load_as_none(self):
+        self.assertIsNone(load_json(self.path, 1))
+        save_json_atomic(self.path, {"version": 1})
+        self.assertIsNone(load_json(self.path, 2))
+        for text in ["{not json", "[1, 2]"]:
+            write_file(self.path, text)
+            self.assertIsNone(load_json(self.path, 1))
+
+
+if __name__ == "__main__":
+    unittest.main()
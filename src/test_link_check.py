@@ -0,0 +1,90 @@
+import contextlib
+import io
+import os
+import unittest
+
+from link_check import BrokenLinksError, SiteIndex, check_links, find_broken_links, report_lines
+from testutil import ProjectTestCase, write_file
+
+
+class TestSiteIndex(unittest.TestCase):
+    def setUp(self):
+        self.index = SiteIndex(
+            ["index.html", os.path.join("blog", "tom", "index.html"), "about.html"],
+            [os.path.join("images", "my pic.png"), "index.css"],
+        )
+
+    def test_pages_are_served_at_their_directory(self):
+        for target in ["/", "/index.html", "/blog/tom", "/blog/tom/index.html"]:
+            self.assertIn(target, self.index)
+        self.assertNotIn("/blog", self.index)
+
+    def test_pages_are_served_without_extension(self):
+        self.assertIn("/about", self.index)
+        self.assertIn("/about.html", self.index)
+
+    def test_static_files(self):
+        self.assertIn("/index.css", self.index)
+        self.assertIn("/images/my pic.png", self.index)
+        self.assertNotIn("/images", self.index)
+
+
+class TestFindBrokenLinks(unittest.TestCase):
+    def test_broken_links_by_page(self):
+        entries = {
+            "b.md": {"output": "b.html", "links": ["/", "/missing", "/a"]},
+            "a.md": {"output": "a.html", "links": ["/b", "/gone.png"]},
+            "index.md": {"output": "index.html", "links": []},
+        }
+        index = SiteIndex([entry["output"] for entry in entries.values()])
+        self.assertEqual(find_broken_links(entries, index), [("a.md", ["/gone.png"]), ("b.md", ["/missing"])])
+
+    def test_report_is_truncated(self):
+        broken = [(f"{i}.md", ["/x"]) for i in range(3)]
+        self.assertEqual(report_lines(broken, limit=2), [
+            "Broken links: 3 in 3 pages",
+            "  0.md: /x",
+            "  1.md: /x",
+            "  ... and 1 more pages",
+        ])
+
+    def test_fail_raises(self):
+        entries = {"a.md": {"output": "a.html", "links": ["/b", "/c"]}}
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.assertEqual(check_links(entries, []), [("a.md", ["/b", "/c"])])
+            with self.assertRaises(BrokenLinksError) as raised:
+                check_links(entries, [], fail=True)
+        self.assertEqual(str(raised.exception), "2 broken link(s) in 1 page(s)")
+
+
+class TestBuildLinkCheck(ProjectTestCase):
+    FILES = {
+        "static/images/a.png": "a",
+        "content/index.md": "# Home\n\n[Post](/blog/post) and ![A](/images/a.png)",
+        "content/blog/post/index.md":
+            "# Post\n\n[Home](../..) [Missing](/blog/missing#top)\n\n```\n[Code](/not/checked)\n```",
+    }
+
+    def test_warn_reports_broken_links(self):
+        output = self.build(check_links="warn")
+        self.assertIn(f"Broken links: 1 in 1 pages\n  {os.path.join('blog', 'post', 'index.md')}: /blog/missing\n",
+                      output)
+
+    def test_error_fails_after_writing_outputs(self):
+        with self.assertRaises(BrokenLinksError):
+            self.build(check_links="error")
+        self.assertTrue(os.path.exists(self.output("blog", "post", "index.html")))
+        self.assertTrue(os.path.exists(self.manifest_path))
+
+    def test_noop_build_still_checks_links(self):
+        self.build()
+        with self.assertRaises(BrokenLinksError):
+            self.build(incremental=True, check_links="error")
+
+    def test_fixed_link_passes(self):
+        write_file(self.path("content", "blog", "missing.md"), "# Missing\n\nHere")
+        self.assertIn("Links: all resolve", self.build(check_links="error"))
+
+
+if __name__ == "__main__":
+    unittest.main()
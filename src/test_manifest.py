@@ -0,0 +1,143 @@
+import os
+import tempfile
+import unittest
+
+from manifest import Manifest
+from output import list_outputs
+from static_sync import list_files
+from testutil import TEMPLATE, ProjectTestCase, write_file
+
+
+class TestIncrementalBuild(ProjectTestCase):
+    FILES = {
+        "static/index.css": "body {}",
+        "content/index.md": "# Home\n\nWelcome",
+        "content/blog/a/index.md": "# A\n\nFirst post",
+        "content/blog/b/index.md": "# B\n\nSecond post",
+    }
+
+    def output_mtime(self, *parts):
+        return os.stat(self.output(*parts)).st_mtime_ns
+
+    def touch_output(self, *parts):
+        os.utime(self.output(*parts), ns=(0, 0))
+
+    def test_full_build_writes_manifest(self):
+        self.build()
+        manifest = Manifest.load(self.manifest_path)
+        self.assertEqual(manifest.basepath, "/")
+        self.assertEqual(
+            sorted(manifest.pages),
+            [os.path.join("blog", "a", "index.md"), os.path.join("blog", "b", "index.md"), "index.md"],
+        )
+        self.assertEqual(manifest.pages["index.md"]["output"], "index.html")
+
+    def test_unchanged_pages_are_left_alone(self):
+        self.build()
+        self.touch_output("index.html")
+        self.touch_output("blog", "a", "index.html")
+
+        write_file(os.path.join(self.project_dir, "content", "blog", "b", "index.md"), "# B\n\nEdited")
+        self.build(incremental=True)
+
+        self.assertEqual(self.output_mtime("index.html"), 0)
+        self.assertEqual(self.output_mtime("blog", "a", "index.html"), 0)
+        with open(os.path.join(self.public_dir, "blog", "b", "index.html"), encoding='utf-8') as f:
+            self.assertIn("<p>Edited</p>", f.read())
+
+    def test_noop_build_leaves_manifest_alone(self):
+        self.build()
+        os.utime(self.manifest_path, ns=(0, 0))
+        self.build(incremental=True)
+        self.assertEqual(os.stat(self.manifest_path).st_mtime_ns, 0)
+
+        write_file(os.path.join(self.project_dir, "content", "index.md"), "# Home\n\nChanged")
+        self.build(incremental=True)
+        self.assertNotEqual(os.stat(self.manifest_path).st_mtime_ns, 0)
+
+    def test_removed_source_deletes_output(self):
+        self.build()
+        os.remove(os.path.join(self.project_dir, "content", "blog", "a", "index.md"))
+        self.build(incremental=True)
+
+        self.assertFalse(os.path.exists(os.path.join(self.public_dir, "blog", "a")))
+        self.assertTrue(os.path.exists(os.path.join(self.public_dir, "blog", "b", "index.html")))
+        self.assertNotIn(os.path.join("blog", "a", "index.md"), Manifest.load(self.manifest_path).pages)
+
+    def test_template_change_rebuilds_everything(self):
+        self.build()
+        self.touch_output("index.html")
+        write_file(os.path.join(self.project_dir, "template.html"), "<main>" + TEMPLATE + "</main>")
+        self.build(incremental=True)
+        self.assertNotEqual(self.output_mtime("index.html"), 0)
+
+    def test_basepath_change_rebuilds_everything(self):
+        write_file(os.path.join(self.project_dir, "content", "index.md"), "# Home\n\n[Post](/blog/a)")
+        self.build()
+        self.touch_output("index.html")
+        self.build(incremental=True, basepath="/site/")
+        self.assertNotEqual(self.output_mtime("index.html"), 0)
+        with open(os.path.join(self.public_dir, "index.html"), encoding='utf-8') as f:
+            self.assertIn('href="/site/blog/a"', f.read())
+
+    def test_missing_output_is_rendered(self):
+        self.build()
+        os.remove(os.path.join(self.public_dir, "index.html"))
+        self.build(incremental=True)
+        self.assertTrue(os.path.exists(os.path.join(self.public_dir, "index.html")))
+
+    def test_incremental_without_manifest_renders_all(self):
+        self.build(incremental=True)
+        self.assertTrue(os.path.exists(os.path.join(self.public_dir, "blog", "a", "index.html")))
+        self.assertTrue(os.path.exists(os.path.join(self.public_dir, "index.css")))
+
+
+class TestOutputRoots(ProjectTestCase):
+    FILES = {
+        "content/index.md": "# Home\n\nWelcome",
+        "content/contact/index.md": "# Contact\n\nMail",
+    }
+
+    def test_full_build_keeps_files_it_did_not_write(self):
+        public_dir = self.path("elsewhere")
+        write_file(os.path.join(public_dir, "notes.txt"), "mine")
+        write_file(os.path.join(public_dir, "sub", "data.csv"), "1,2")
+        self.build(public_dir)
+        os.remove(self.path("content", "contact", "index.md"))
+        self.build(public_dir)
+
+        self.assertEqual(list_files(public_dir), ["index.html", "notes.txt", os.path.join("sub", "data.csv")])
+
+    def test_full_build_prunes_its_own_root(self):
+        public_dir = self.path("site")
+        self.build(public_dir)
+        write_file(os.path.join(public_dir, "leftover.html"), "old")
+        self.build(public_dir)
+        self.assertEqual(list_outputs(public_dir), [os.path.join("contact", "index.html"), "index.html"])
+
+    def test_output_roots_keep_separate_records(self):
+        for manifest_path in [None, self.path("shared.json")]:
+            root_a = self.path(f"a-{bool(manifest_path)}")
+            root_b = self.path(f"b-{bool(manifest_path)}")
+            write_file(self.path("content", "contact", "index.md"), "# Contact\n\nMail")
+            self.build(root_a, incremental=True, manifest_path=manifest_path)
+            os.remove(self.path("content", "contact", "index.md"))
+            self.build(root_b, incremental=True, manifest_path=manifest_path)
+            self.build(root_a, incremental=True, manifest_path=manifest_path)
+
+            self.assertFalse(os.path.exists(os.path.join(root_a, "contact", "index.html")))
+            self.assertEqual(list_outputs(root_a), list_outputs(root_b))
+
+
+class TestManifestLoad(unittest.TestCase):
+    def test_corrupt_manifest_is_empty(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "manifest.json")
+            write_file(path, "{not json")
+            manifest = Manifest.load(path)
+            self.assertEqual(manifest.pages, {})
+            self.assertIsNone(manifest.template_hash)
+
+
+if __name__ == "__main__":
+    unittest.main()
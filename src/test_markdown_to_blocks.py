@@ -1,5 +1,5 @@
 import unittest
-from markdown_to_blocks import markdown_to_blocks, BlockType, detect_block_type
+from markdown_to_blocks import markdown_to_blocks, BlockType, detect_block_type, iter_blocks, scan_blocks, Block
 
 class TestMarkdownToBlocks(unittest.TestCase):
         def test_markdown_to_blocks(self):
@@ -164,5 +164,60 @@ class TestBlockTypeDetection(unittest.TestCase):
         self.assertEqual(detect_block_type(long_heading), BlockType.HEADING)
 
 
+class TestScanBlocks(unittest.TestCase):
+    def test_typed_blocks_with_line_ranges(self):
+        md = "# Title\n\n> quote\n> more\n\n\n- a\n- b\n\n1. one\n2. two\n\ntext"
+        self.assertEqual(scan_blocks(md), [
+            Block(BlockType.HEADING, ["# Title"], 0, 1),
+            Block(BlockType.QUOTE, ["> quote", "> more"], 2, 4),
+            Block(BlockType.UNORDERED_LIST, ["- a", "- b"], 6, 8),
+            Block(BlockType.ORDERED_LIST, ["1. one", "2. two"], 9, 11),
+            Block(BlockType.PARAGRAPH, ["text"], 12, 13),
+        ])
+
+    def test_fenced_code_keeps_blank_lines(self):
+        md = "Intro\n\n```python\ndef f():\n\n    return 1\n```\n\nOutro"
+        blocks = scan_blocks(md)
+        self.assertEqual([block.block_type for block in blocks],
+                         [BlockType.PARAGRAPH, BlockType.CODE, BlockType.PARAGRAPH])
+        self.assertEqual(blocks[1].text, "```python\ndef f():\n\n    return 1\n```")
+
+    def test_fence_ends_block_without_blank_line(self):
+        blocks = scan_blocks("```\ncode\n```\nafter")
+        self.assertEqual([block.text for block in blocks], ["```\ncode\n```", "after"])
+
+    def test_unclosed_fence_is_ordinary_block(self):
+        blocks = scan_blocks("```\ncode\n\nmore")
+        self.assertEqual([block.block_type for block in blocks], [BlockType.PARAGRAPH, BlockType.PARAGRAPH])
+
+    def test_many_unclosed_fences(self):
+        md = "\n\n".join(["```js\nlet a;"] * 1500 + ["```js b```"])
+        blocks = scan_blocks(md)
+        self.assertEqual(markdown_to_blocks(md), md.split("\n\n"))
+        self.assertEqual(blocks[-1].block_type, BlockType.CODE)
+        self.assertEqual((blocks[-1].start, blocks[-1].end), (4500, 4501))
+
+    def test_whitespace_only_line_separates_blocks(self):
+        self.assertEqual(markdown_to_blocks("one\n   \ntwo"), ["one", "two"])
+
+    def test_iter_blocks_is_lazy(self):
+        def lines():
+            yield "# Title"
+            yield ""
+            raise AssertionError("read past the first block")
+
+        self.assertEqual(next(iter_blocks(lines())), Block(BlockType.HEADING, ["# Title"], 0, 1))
+
+    def test_iter_blocks_matches_scan_blocks(self):
+        md = "# T\n\n```\nunclosed\n\n- a\n- b\n\n> quote"
+        self.assertEqual(list(iter_blocks(iter(md.split("\n")))), scan_blocks(md))
+        self.assertEqual([block.block_type for block in scan_blocks(md)],
+                         [BlockType.HEADING, BlockType.PARAGRAPH, BlockType.UNORDERED_LIST, BlockType.QUOTE])
+        self.assertEqual(scan_blocks(md)[2].start, 5)
+
+    def test_strips_block_edges(self):
+        self.assertEqual(markdown_to_blocks("   # Heading  \n\n  - a\n  - b  "), ["# Heading", "- a\n  - b"])
+
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
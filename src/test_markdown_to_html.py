@@ -1,5 +1,6 @@
 import unittest
-from markdown_to_html import markdown_to_html_node
+from markdown_to_blocks import BlockType
+from markdown_to_html import convert_block_to_html, markdown_to_html_node
 
 class TestMarkdownToHtml(unittest.TestCase):
     def test_lists(self):
@@ -84,6 +85,66 @@ the **same** even with inline stuff
             html,
             "<div><pre><code>This is text that _should_ remain\nthe **same** even with inline stuff</code></pre></div>",
         )
+    def test_long_ordered_list(self):
+        md = "\n".join(f"{i}. item {i}" for i in range(1, 1001))
+        html = markdown_to_html_node(md).to_html()
+        self.assertTrue(html.startswith("<div><ol><li>item 1</li><li>item 2</li>"))
+        self.assertTrue(html.endswith("<li>item 1000</li></ol></div>"))
+
+    def test_ordered_list_numbers_must_count_up(self):
+        with self.assertRaises(ValueError):
+            convert_block_to_html("1. one\n01. two", BlockType.ORDERED_LIST)
+
+    def test_code_with_blank_lines(self):
+        md = """
+```
+first
+
+second
+```
+"""
+
+        html = markdown_to_html_node(md).to_html()
+        self.assertEqual(html, "<div><pre><code>first\n\nsecond</code></pre></div>")
+
+    def test_resolve_url_rewrites_links_and_images_only(self):
+        md = """
+See [home](/) and ![logo](/images/logo.png) or [out](https://boot.dev)
+
+```
+<a href="/raw">untouched</a>
+```
+"""
+
+        node = markdown_to_html_node(md, lambda url: "/site" + url if url.startswith("/") else url)
+        html = node.to_html()
+        self.assertEqual(
+            html,
+            '<div><p>See <a href="/site/">home</a> and <img src="/site/images/logo.png" alt="logo"></img> or <a href="https://boot.dev">out</a></p><pre><code><a href="/raw">untouched</a></code></pre></div>',
+        )
+    def test_inline_html_fast_path_matches_tree(self):
+        md = """
+# Title with **bold**
+
+Some _italic_ text and a [link](/x)
+
+- item `code`
+- ![img](/i.png)
+
+1. one
+2. two
+
+> quoted **text**
+
+```
+raw _text_
+```
+"""
+
+        tree = markdown_to_html_node(md, lambda url: "/base" + url)
+        fast = markdown_to_html_node(md, lambda url: "/base" + url, inline_html=True)
+        self.assertEqual(tree.to_html(), fast.to_html())
+        self.assertEqual(fast.children[1].children[0].tag, None)
 
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
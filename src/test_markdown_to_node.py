@@ -1,6 +1,7 @@
+import random
 import unittest
 from textnode import TextNode, TextType
-from markdown_to_nodes import split_nodes, split_nodes_image, split_nodes_link
+from markdown_to_nodes import split_nodes, split_nodes_image, split_nodes_link, text_to_html, text_to_nodes, text_to_nodes_cascade
 
 class TestSplitNodes(unittest.TestCase):
     def test_basic_code_conversion(self):
@@ -296,5 +297,87 @@ class TestSplitNodes(unittest.TestCase):
                                TextNode("link here", TextType.LINK, "https://google.com")],new_nodes)
 
 
+class TestTextToNodes(unittest.TestCase):
+    def assertMatchesCascade(self, text):
+        try:
+            expected = text_to_nodes_cascade(text)
+        except ValueError:
+            with self.assertRaises(ValueError, msg=repr(text)):
+                text_to_nodes(text)
+            return
+        self.assertListEqual(expected, text_to_nodes(text), msg=repr(text))
+
+    def test_all_inline_types(self):
+        nodes = text_to_nodes(
+            "This is **text** with an _italic_ word and a `code block` and an "
+            "![obi wan image](https://i.imgur.com/fJRm4Vk.jpeg) and a [link](https://boot.dev)"
+        )
+        self.assertListEqual(
+            [
+                TextNode("This is ", TextType.NORMAL),
+                TextNode("text", TextType.BOLD),
+                TextNode(" with an ", TextType.NORMAL),
+                TextNode("italic", TextType.ITALIC),
+                TextNode(" word and a ", TextType.NORMAL),
+                TextNode("code block", TextType.CODE),
+                TextNode(" and an ", TextType.NORMAL),
+                TextNode("obi wan image", TextType.IMAGE, "https://i.imgur.com/fJRm4Vk.jpeg"),
+                TextNode(" and a ", TextType.NORMAL),
+                TextNode("link", TextType.LINK, "https://boot.dev"),
+            ],
+            nodes,
+        )
+
+    def test_delimiters_inside_spans(self):
+        for text in [
+            "**bold _not italic_ `not code`**",
+            "_italic `not code`_",
+            "_italic **broken**_",
+            "`code _broken_`",
+            "a***b***c",
+            "a `` b __ c **** d",
+            "[x](y ![a)b](c)",
+            "![img](a.png)[link](b)![](c)[](d)",
+            "unclosed ** after [link](url)",
+        ]:
+            self.assertMatchesCascade(text)
+
+    def test_empty(self):
+        self.assertListEqual(text_to_nodes(""), [])
+
+    def test_differential_random(self):
+        rng = random.Random(1234)
+        alphabet = ["a", "b", " ", "*", "**", "_", "`", "[", "]", "(", ")", "!", "![i](u)", "[l](v)"]
+        for _ in range(5000):
+            text = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 16)))
+            self.assertMatchesCascade(text)
+
+
+class TestTextToHtml(unittest.TestCase):
+    def assertMatchesNodes(self, text, resolve_url=None):
+        try:
+            nodes = text_to_nodes(text)
+        except ValueError:
+            with self.assertRaises(ValueError, msg=repr(text)):
+                text_to_html(text, resolve_url)
+            return
+        expected = "".join(node.text_node_to_html_node(resolve_url).to_html() for node in nodes)
+        self.assertEqual(expected, text_to_html(text, resolve_url), msg=repr(text))
+
+    def test_all_inline_types(self):
+        self.assertEqual(
+            text_to_html("**b** _i_ `c` [l](/x) ![a](/y.png)", lambda url: "/site" + url),
+            '<b>b</b> <i>i</i> <code>c</code> <a href="/site/x">l</a> <img src="/site/y.png" alt="a"></img>',
+        )
+
+    def test_differential_random(self):
+        rng = random.Random(4321)
+        alphabet = ["a", " ", "**", "_", "`", "[", "]", "(", ")", "!", "![i](/u)", "[l](v)"]
+        for _ in range(3000):
+            text = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 16)))
+            self.assertMatchesNodes(text)
+            self.assertMatchesNodes(text, lambda url: "/base" + url)
+
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
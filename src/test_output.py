@@ -0,0 +1,72 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import output
+from output import OutputWriter, encode_chunks
+from testutil import read_file
+
+
+class TestOutputWriter(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dest = os.path.join(self.tmp.name, "a", "b", "page.html")
+        self.writer = OutputWriter()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_creates_directories_once(self):
+        with mock.patch("os.makedirs", wraps=os.makedirs) as makedirs:
+            self.writer.write(self.dest, ["one"])
+            self.writer.write(os.path.join(os.path.dirname(self.dest), "other.html"), ["two"])
+        created = [call.args[0] for call in makedirs.call_args_list]
+        self.assertEqual(created.count(os.path.dirname(self.dest)), 1)
+        self.assertEqual(read_file(self.dest), "one")
+
+    def test_unchanged_content_is_skipped(self):
+        self.assertTrue(self.writer.write(self.dest, ["<p>", "same", "</p>"]))
+        os.utime(self.dest, ns=(0, 0))
+        self.assertFalse(self.writer.write(self.dest, ["<p>same</p>"]))
+        self.assertEqual(os.stat(self.dest).st_mtime_ns, 0)
+        self.assertEqual((self.writer.written, self.writer.skipped), (1, 1))
+
+    def test_changed_content_is_replaced(self):
+        self.writer.write(self.dest, ["shared prefix, old tail"])
+        inode = os.stat(self.dest).st_ino
+        self.assertTrue(self.writer.write(self.dest, ["shared prefix, ", "new tail"]))
+        self.assertEqual(read_file(self.dest), "shared prefix, new tail")
+        self.assertNotEqual(os.stat(self.dest).st_ino, inode)
+
+    def test_prefix_of_existing_file_is_written(self):
+        self.writer.write(self.dest, ["longer content"])
+        self.assertTrue(self.writer.write(self.dest, ["longer"]))
+        self.assertEqual(read_file(self.dest), "longer")
+
+    def test_prefix_is_copied_across_pieces(self):
+        with mock.patch.object(output, "WRITE_BUFFER_SIZE", 4):
+            chunks = [f"line {i}\n" for i in range(50)]
+            self.writer.write(self.dest, chunks)
+            chunks[40] = "changed\n"
+            self.writer.write(self.dest, chunks)
+        self.assertEqual(read_file(self.dest), "".join(chunks))
+
+    def test_failed_render_keeps_old_output(self):
+        self.writer.write(self.dest, ["old"])
+
+        def chunks():
+            yield "new"
+            raise ValueError("render failed")
+
+        with self.assertRaises(ValueError):
+            self.writer.write(self.dest, chunks())
+        self.assertEqual(read_file(self.dest), "old")
+        self.assertEqual(os.listdir(os.path.dirname(self.dest)), ["page.html"])
+
+    def test_encode_chunks(self):
+        self.assertEqual(list(encode_chunks(["ab", "cd", "é"], 3)), [b"abcd", "é".encode('utf-8')])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,51 @@
+import filecmp
+import os
+import unittest
+
+from parallel import RenderError, make_batches
+from testutil import ProjectTestCase, write_file
+
+
+class TestMakeBatches(unittest.TestCase):
+    def test_batches_cover_every_page_in_order(self):
+        pages = [(f"src{i}", f"dest{i}") for i in range(1000)]
+        batches = make_batches(pages, 4)
+        self.assertEqual([page for batch in batches for page in batch], pages)
+        self.assertTrue(all(len(batch) <= 64 for batch in batches))
+
+    def test_small_site_gets_single_page_batches(self):
+        pages = [("a", "b"), ("c", "d")]
+        self.assertEqual(make_batches(pages, 8), [[("a", "b")], [("c", "d")]])
+
+
+class TestParallelBuild(ProjectTestCase):
+    FILES = {
+        f"content/blog/post{i}/index.md":
+            f"# Post {i}\n\nSome **bold** text and a [link](/blog/post{i})\n\n- one\n- two"
+        for i in range(20)
+    }
+
+    def test_output_matches_serial_build(self):
+        serial_dir, parallel_dir = self.path("serial"), self.path("parallel")
+        self.build(serial_dir, basepath="/site/", jobs=1)
+        self.build(parallel_dir, basepath="/site/", jobs=3)
+        comparison = filecmp.dircmp(serial_dir, parallel_dir)
+        self.assertEqual(comparison.left_only + comparison.right_only, [])
+        for i in range(20):
+            relative = os.path.join("blog", f"post{i}", "index.html")
+            self.assertTrue(filecmp.cmp(os.path.join(serial_dir, relative),
+                                        os.path.join(parallel_dir, relative), shallow=False))
+
+    def test_page_errors_are_reported(self):
+        write_file(self.path("content", "broken.md"), "no title here")
+        write_file(self.path("content", "unclosed.md"), "# Title\n\nthis **never closes")
+        with self.assertRaises(RenderError) as context:
+            self.build(self.path("parallel"), basepath="/site/", jobs=2)
+
+        failed = sorted(os.path.basename(path) for path, _ in context.exception.failures)
+        self.assertEqual(failed, ["broken.md", "unclosed.md"])
+        self.assertTrue(os.path.exists(self.path("parallel", "blog", "post0", "index.html")))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,100 @@
+import contextlib
+import filecmp
+import io
+import threading
+import time
+import unittest
+
+from output import list_outputs
+from parallel import RenderError
+from pipeline import run_pipeline
+from testutil import ProjectTestCase, write_file
+
+
+class TestRunPipeline(unittest.TestCase):
+    def test_every_page_passes_through_each_stage(self):
+        pages = [(f"src{i}", f"dest{i}") for i in range(50)]
+        written = {}
+        render_threads = set()
+
+        def render(page, data):
+            render_threads.add(threading.get_ident())
+            return data.upper()
+
+        count = run_pipeline(pages, lambda page: page[0], render,
+                             lambda page, result: written.__setitem__(page[1], result), depth=2)
+
+        self.assertEqual(count, 50)
+        self.assertEqual(written, {f"dest{i}": f"SRC{i}" for i in range(50)})
+        self.assertEqual(render_threads, {threading.get_ident()})
+
+    def test_queue_depth_bounds_read_ahead(self):
+        pages = [(str(i), str(i)) for i in range(40)]
+        lock = threading.Lock()
+        in_flight = []
+        peak = [0]
+
+        def read(page):
+            with lock:
+                in_flight.append(page)
+                peak[0] = max(peak[0], len(in_flight))
+            return page
+
+        def render(page, data):
+            time.sleep(0.001)
+            with lock:
+                in_flight.remove(page)
+            return data
+
+        run_pipeline(pages, read, render, lambda page, result: None, depth=3, readers=4)
+        # At most `depth` pages queued, plus one held by each blocked reader
+        # and the one being rendered.
+        self.assertLessEqual(peak[0], 3 + 4 + 1)
+
+    def test_failures_in_any_stage_are_collected(self):
+        pages = [("read", ""), ("render", ""), ("write", ""), ("ok", "")]
+        written = []
+
+        def stage(name):
+            def run(page, *args):
+                if page[0] == name:
+                    raise ValueError(name)
+                return page[0]
+            return run
+
+        output = io.StringIO()
+        with self.assertRaises(RenderError) as raised, contextlib.redirect_stdout(output):
+            run_pipeline(pages, stage("read"), stage("render"),
+                         lambda page, result: stage("write")(page) and written.append(result))
+        self.assertEqual(output.getvalue().count("Error generating"), 3)
+        self.assertEqual(sorted(source for source, _ in raised.exception.failures), ["read", "render", "write"])
+        self.assertEqual(written, ["ok"])
+
+    def test_no_pages(self):
+        self.assertEqual(run_pipeline([], None, None, None), 0)
+
+
+class TestPipelinedBuild(ProjectTestCase):
+    FILES = {
+        f"content/blog/post{i}/index.md": f"# Post {i}\n\nSome **bold** text and a [link](/blog/post{i})"
+        for i in range(12)
+    }
+
+    def test_matches_serial_build(self):
+        serial, pipelined = self.path("serial"), self.path("pipelined")
+        self.build(serial, basepath="/site/")
+        self.build(pipelined, basepath="/site/", queue_depth=2)
+        files = list_outputs(serial)
+        self.assertEqual(list_outputs(pipelined), files)
+        self.assertEqual(len(files), 12)
+        _, mismatch, errors = filecmp.cmpfiles(serial, pipelined, files, shallow=False)
+        self.assertEqual(mismatch + errors, [])
+
+    def test_render_error_is_raised(self):
+        write_file(self.path("content", "broken.md"), "no title")
+        with self.assertRaises(RenderError):
+            self.build(self.path("pipelined"), basepath="/site/", queue_depth=2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,96 @@
+import csv
+import json
+import os
+import tempfile
+import unittest
+
+from main import generate_page
+from profiling import NULL_TIMER, PHASES, BuildProfile, PageTimer
+from testutil import TEMPLATE, ProjectTestCase, write_file
+
+
+class TestPageTimer(unittest.TestCase):
+    def test_phases_accumulate(self):
+        timer = PageTimer()
+        with timer.phase("read"):
+            pass
+        with timer.phase("read"):
+            pass
+        self.assertEqual(list(timer.phases), ["read"])
+        wall, cpu = timer.phases["read"]
+        self.assertGreaterEqual(wall, 0)
+        self.assertGreaterEqual(cpu, 0)
+
+    def test_null_timer(self):
+        with NULL_TIMER.phase("read"):
+            pass
+
+    def test_profiled_page_matches_streamed_page(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            source = os.path.join(tmp, "page.md")
+            template_path = os.path.join(tmp, "template.html")
+            write_file(source, "# Title\n\nSome **bold** [link](/x)\n\n- a\n- b")
+            write_file(template_path, TEMPLATE)
+            timer = PageTimer()
+            generate_page(source, template_path, os.path.join(tmp, "profiled.html"), "/site/", timer)
+            generate_page(source, template_path, os.path.join(tmp, "streamed.html"), "/site/")
+
+            self.assertEqual(tuple(timer.phases), PHASES)
+            with open(os.path.join(tmp, "profiled.html"), encoding='utf-8') as profiled, \
+                    open(os.path.join(tmp, "streamed.html"), encoding='utf-8') as streamed:
+                self.assertEqual(profiled.read(), streamed.read())
+
+
+class TestBuildProfile(unittest.TestCase):
+    def setUp(self):
+        self.profile = BuildProfile()
+        self.profile.add("fast.md", {"read": (0.001, 0.001), "write": (0.001, 0.0)})
+        self.profile.add("slow.md", {"read": (0.5, 0.1), "write": (0.25, 0.2)})
+
+    def test_totals(self):
+        totals = self.profile.totals()
+        self.assertEqual(list(totals)[:len(PHASES)], list(PHASES))
+        self.assertAlmostEqual(totals["read"]["wall"], 0.501)
+        self.assertAlmostEqual(totals["write"]["cpu"], 0.2)
+        self.assertEqual(totals["to_html"], {"wall": 0.0, "cpu": 0.0})
+
+    def test_slowest(self):
+        slowest = self.profile.slowest(1)
+        self.assertEqual(len(slowest), 1)
+        self.assertEqual(slowest[0]["page"], "slow.md")
+        self.assertAlmostEqual(slowest[0]["wall"], 0.75)
+
+    def test_csv_report(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "profile.csv")
+            self.profile.write_report(path)
+            with open(path, encoding='utf-8', newline='') as f:
+                rows = list(csv.reader(f))
+            self.assertEqual(rows[0], ["page", "phase", "wall", "cpu"])
+            self.assertEqual(len(rows), 5)
+
+
+class TestBuildWithProfile(ProjectTestCase):
+    FILES = {
+        "content/index.md": "# Home",
+        "content/blog/index.md": "# Blog\n\n- one",
+    }
+
+    def profile(self, **kwargs):
+        self.build(profile_path=self.path("profile.json"), **kwargs)
+        with open(self.path("profile.json"), encoding='utf-8') as f:
+            return json.load(f)
+
+    def test_build_writes_json_report(self):
+        report = self.profile()
+        self.assertEqual(report["page_count"], 2)
+        self.assertEqual(list(report["phases"]), list(PHASES))
+        self.assertEqual(len(report["slowest_pages"]), 2)
+
+    def test_pipelined_build_times_reads(self):
+        report = self.profile(queue_depth=2)
+        self.assertEqual([tuple(page["phases"]) for page in report["slowest_pages"]], [PHASES] * 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,97 @@
+import os
+import tempfile
+import unittest
+
+from markdown_to_blocks import scan_blocks
+from render_cache import BlockCache, block_key
+from testutil import ProjectTestCase, read_file, write_file
+
+
+class TestBlockCache(unittest.TestCase):
+    def test_key_depends_on_context(self):
+        self.assertEqual(block_key("a", "/"), block_key("a", "/"))
+        self.assertNotEqual(block_key("a", "/"), block_key("a", "/site/"))
+        self.assertNotEqual(block_key("a"), block_key("b"))
+
+    def test_render_counts_hits_and_misses(self):
+        cache = BlockCache()
+        calls = []
+
+        def render(block):
+            calls.append(block.text)
+            return f"<p>{block.text}</p>"
+
+        x, y = scan_blocks("x\n\ny")
+        self.assertEqual(cache.render(x, "/", render), "<p>x</p>")
+        self.assertEqual(cache.render(x, "/", render), "<p>x</p>")
+        self.assertEqual(cache.render(y, "/", render), "<p>y</p>")
+        self.assertEqual(calls, ["x", "y"])
+        self.assertEqual((cache.hits, cache.misses), (1, 2))
+
+    def test_lru_eviction(self):
+        cache = BlockCache(max_entries=2)
+        cache.put("a", "1")
+        cache.put("b", "2")
+        cache.get("a")
+        cache.put("c", "3")
+        self.assertEqual(list(cache.entries), ["a", "c"])
+
+    def test_save_and_load(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "cache", "blocks.json")
+            cache = BlockCache(path=path)
+            for key in "abc":
+                cache.put(key, key.upper())
+            cache.save()
+
+            self.assertEqual(BlockCache.load(path).entries, cache.entries)
+            self.assertEqual(list(BlockCache.load(path, max_entries=2).entries), ["b", "c"])
+
+    def test_load_missing_or_corrupt(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "blocks.json")
+            self.assertEqual(len(BlockCache.load(path).entries), 0)
+            write_file(path, "not json")
+            self.assertEqual(len(BlockCache.load(path).entries), 0)
+
+    def test_take_delta_and_merge(self):
+        worker = BlockCache(track_new=True)
+        block, = scan_blocks("x")
+        worker.render(block, "/", lambda block: "X")
+        worker.render(block, "/", lambda block: "X")
+        entries, hits, misses = worker.take_delta()
+        self.assertEqual((len(entries), hits, misses), (1, 1, 1))
+        self.assertEqual(worker.take_delta(), ({}, 0, 0))
+
+        parent = BlockCache()
+        parent.merge(entries, hits, misses)
+        self.assertEqual(parent.entries, worker.entries)
+        self.assertEqual((parent.hits, parent.misses), (1, 1))
+
+
+FOOTER = "Licensed under **CC BY** - see [license](/license)"
+
+
+class TestBuildWithBlockCache(ProjectTestCase):
+    FILES = {f"content/page{i}.md": f"# Page {i}\n\n{FOOTER}" for i in range(4)}
+
+    def render(self, name, **kwargs):
+        """Build into the output root `name` and return its page3.html."""
+        self.build(self.path(name), basepath="/site/", **kwargs)
+        return read_file(self.path(name, "page3.html"))
+
+    def test_cached_output_matches_uncached(self):
+        plain = self.render("plain")
+        self.assertEqual(self.render("cached", block_cache=True), plain)
+        self.assertEqual(self.render("cached", block_cache=True), plain)
+        self.assertEqual(self.render("parallel", block_cache=True, jobs=2), plain)
+        self.assertTrue(os.path.exists(self.path("cache", "blocks.json")))
+
+    def test_cache_persists_between_builds(self):
+        self.render("cached", block_cache=True)
+        cache = BlockCache.load(self.path("cache", "blocks.json"))
+        self.assertEqual(len(cache.entries), 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,81 @@
+import contextlib
+import io
+import os
+import unittest
+
+from server import SiteWatcher, diff_snapshots
+from testutil import ProjectTestCase, read_file, write_file
+
+
+class TestDiffSnapshots(unittest.TestCase):
+    def test_changed_and_removed(self):
+        old = {"a": (1, 1), "b": (1, 1), "c": (1, 1)}
+        new = {"a": (1, 1), "b": (2, 1), "d": (1, 1)}
+        changed, removed = diff_snapshots(old, new)
+        self.assertEqual(sorted(changed), ["b", "d"])
+        self.assertEqual(removed, ["c"])
+
+
+class TestSiteWatcher(ProjectTestCase):
+    FILES = {
+        "static/index.css": "body {}",
+        "content/index.md": "# Home\n\nWelcome",
+        "content/blog/a/index.md": "# A\n\nFirst post",
+    }
+
+    def setUp(self):
+        super().setUp()
+        self.build()
+        self.watcher = SiteWatcher(self.project_dir, self.public_dir)
+
+    def poll(self):
+        """Poll the watcher and return what it printed."""
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            self.watcher.poll()
+        return output.getvalue()
+
+    def test_no_changes(self):
+        self.assertEqual(self.watcher.poll(), ([], []))
+
+    def test_edit_rerenders_only_that_page(self):
+        os.utime(self.output("index.html"), ns=(0, 0))
+        write_file(self.path("content", "blog", "a", "index.md"), "# A\n\nEdited", mtime_ns=10**18)
+        self.poll()
+
+        self.assertIn("<p>Edited</p>", read_file(self.output("blog", "a", "index.html")))
+        self.assertEqual(os.stat(self.output("index.html")).st_mtime_ns, 0)
+
+    def test_new_and_removed_pages(self):
+        write_file(self.path("content", "blog", "b", "index.md"), "# B\n\nNew")
+        os.remove(self.path("content", "blog", "a", "index.md"))
+        self.poll()
+
+        self.assertIn("<h1>B</h1>", read_file(self.output("blog", "b", "index.html")))
+        self.assertFalse(os.path.exists(self.output("blog", "a")))
+
+    def test_template_change_rerenders_all(self):
+        write_file(self.path("template.html"), "<main>{{ Content }}</main>", mtime_ns=10**18)
+        self.poll()
+
+        self.assertTrue(read_file(self.output("index.html")).startswith("<main>"))
+        self.assertTrue(read_file(self.output("blog", "a", "index.html")).startswith("<main>"))
+
+    def test_static_changes_are_synced(self):
+        write_file(self.path("static", "images", "logo.svg"), "<svg/>")
+        os.remove(self.path("static", "index.css"))
+        self.poll()
+
+        self.assertEqual(read_file(self.output("images", "logo.svg")), "<svg/>")
+        self.assertFalse(os.path.exists(self.output("index.css")))
+
+    def test_render_errors_do_not_stop_the_watcher(self):
+        write_file(self.path("content", "broken.md"), "no title")
+        self.assertIn("Error generating", self.poll())
+        write_file(self.path("content", "broken.md"), "# Fixed", mtime_ns=10**18)
+        self.poll()
+        self.assertIn("<h1>Fixed</h1>", read_file(self.output("broken.html")))
+
+
+if __name__ == "__main__":
+    unittest.main()
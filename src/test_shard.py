@@ -0,0 +1,119 @@
+import contextlib
+import filecmp
+import io
+import os
+import subprocess
+import sys
+import unittest
+
+from main import find_pages
+from output import claim_output_root, list_outputs
+from shard import IncompleteShardsError, ShardConflictError, merge_shards, parse_shard, select_shard, shard_of
+from static_sync import list_files
+from testutil import ProjectTestCase, write_file
+
+SRC_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+class TestSharding(unittest.TestCase):
+    def test_parse_shard(self):
+        self.assertEqual(parse_shard("2/4"), (2, 4))
+        for spec in ["0/4", "5/4", "2", "a/b"]:
+            with self.assertRaises(ValueError):
+                parse_shard(spec)
+
+    def test_shard_of_is_stable(self):
+        self.assertEqual(shard_of(os.path.join("blog", "tom", "index.md"), 4), shard_of("blog/tom/index.md", 4))
+        self.assertEqual(shard_of("index.md", 1), 1)
+        # Fixed by the hash function, not by this process's hash seed.
+        result = subprocess.run([sys.executable, "-c", "import shard; print(shard.shard_of('blog/tom/index.md', 7))"],
+                                cwd=SRC_DIR, capture_output=True, text=True, check=True,
+                                env={**os.environ, "PYTHONHASHSEED": "123"})
+        self.assertEqual(int(result.stdout), shard_of("blog/tom/index.md", 7))
+
+    def test_shards_partition_pages(self):
+        pages = [(os.path.join("/content", f"p{i}.md"), os.path.join("/docs", f"p{i}.html")) for i in range(200)]
+        shards = [select_shard(pages, "/content", index, 3) for index in (1, 2, 3)]
+        self.assertEqual(sorted(page for shard in shards for page in shard), sorted(pages))
+        self.assertTrue(all(shard for shard in shards))
+
+
+class TestShardedBuild(ProjectTestCase):
+    FILES = {
+        "static/index.css": "body {}",
+        **{f"content/p{i}/index.md": f"# Page {i}\n\n[Next](/p{(i + 1) % 12})" for i in range(12)},
+    }
+
+    def build_shards(self, count):
+        code = ("import contextlib, io, sys, main\n"
+                "index = int(sys.argv[1])\n"
+                "with contextlib.redirect_stdout(io.StringIO()):\n"
+                f"    main.build({self.project_dir!r}, {self.path('shard')!r} + sys.argv[1], "
+                f"manifest_path={self.path('cache')!r} + sys.argv[1] + '.json', shard=(index, {count}), "
+                "check_links='error')\n")
+        processes = [subprocess.Popen([sys.executable, "-c", code, str(index)], cwd=SRC_DIR)
+                     for index in range(1, count + 1)]
+        for process in processes:
+            self.assertEqual(process.wait(), 0)
+        return [self.path(f"shard{index}") for index in range(1, count + 1)]
+
+    def shard_root(self, name, index, count):
+        claim_output_root(self.path(name), (index, count))
+        return self.path(name)
+
+    def merge(self, shard_dirs, public_dir):
+        with contextlib.redirect_stdout(io.StringIO()):
+            return merge_shards(shard_dirs, public_dir)
+
+    def test_merged_shards_match_unsharded_build(self):
+        self.build(self.path("full"))
+        shard_dirs = self.build_shards(3)
+
+        pages = find_pages(os.path.join(self.project_dir, "content"), self.path("full"))
+        rendered = [sum(1 for name in list_files(shard_dir) if name.endswith(".html")) for shard_dir in shard_dirs]
+        self.assertEqual(sum(rendered), len(pages))
+
+        self.assertEqual(self.merge(shard_dirs, self.path("merged")), 13)
+        self.assertEqual(list_outputs(self.path("full")), list_outputs(self.path("merged")))
+        for name in list_outputs(self.path("full")):
+            self.assertTrue(filecmp.cmp(self.path("full", name), self.path("merged", name), shallow=False), name)
+
+    def test_conflicting_outputs_fail_before_writing(self):
+        shard_dirs = [self.shard_root("a", 1, 2), self.shard_root("b", 2, 2)]
+        write_file(self.path("a", "index.html"), "one")
+        write_file(self.path("b", "index.html"), "two")
+        write_file(self.path("b", "index.css"), "same")
+        write_file(self.path("a", "index.css"), "same")
+        with self.assertRaises(ShardConflictError) as raised:
+            self.merge(shard_dirs, self.path("merged"))
+        self.assertEqual([conflict[0] for conflict in raised.exception.conflicts], ["index.html"])
+        self.assertFalse(os.path.exists(self.path("merged")))
+
+    def test_missing_or_incomplete_shards_fail_before_writing(self):
+        write_file(self.path("merged", "index.html"), "kept")
+        shard_dirs = [self.shard_root("a", 1, 3), self.shard_root("b", 2, 3)]
+        write_file(self.path("plain", "index.html"), "not a shard")
+        for dirs in [shard_dirs, shard_dirs + [self.path("typo")], shard_dirs + [self.path("plain")],
+                     shard_dirs + [self.shard_root("c", 2, 3)], [self.shard_root("d", 1, 1), shard_dirs[1]]]:
+            with self.assertRaises(IncompleteShardsError):
+                self.merge(dirs, self.path("merged"))
+        self.assertEqual(list_files(self.path("merged")), ["index.html"])
+
+    def test_merge_removes_stale_outputs(self):
+        shard_dir = self.shard_root("a", 1, 1)
+        write_file(self.path("a", "index.html"), "home")
+        self.merge([shard_dir], self.path("merged"))
+        write_file(self.path("merged", "old", "index.html"), "stale")
+        self.merge([self.path("a")], self.path("merged"))
+        self.assertEqual(list_outputs(self.path("merged")), ["index.html"])
+
+    def test_merge_keeps_files_it_did_not_write(self):
+        shard_dir = self.shard_root("a", 1, 1)
+        write_file(self.path("a", "index.html"), "home")
+        write_file(self.path("elsewhere", "notes.txt"), "mine")
+        self.merge([shard_dir], self.path("elsewhere"))
+        self.assertEqual(list_files(self.path("elsewhere")), ["index.html", "notes.txt"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,77 @@
+import mmap
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import source
+from source import find_title, iter_lines, open_source, read_front_matter
+
+
+class TestIterLines(unittest.TestCase):
+    def test_lines_without_newlines(self):
+        self.assertEqual(list(iter_lines(b"a\nb\n\nc")), ["a", "b", "", "c"])
+        self.assertEqual(list(iter_lines(b"a\n")), ["a"])
+        self.assertEqual(list(iter_lines(b"")), [])
+
+    def test_starts_at_offset(self):
+        self.assertEqual(list(iter_lines(b"skip\nkeep\n", 5)), ["keep"])
+
+    def test_crlf(self):
+        self.assertEqual(list(iter_lines(b"a\r\nb\r\n")), ["a", "b"])
+
+    def test_small_chunks_keep_lines_whole(self):
+        text = "".join(f"line {i} éè\n" for i in range(100))
+        with mock.patch.object(source, "DECODE_CHUNK_SIZE", 7):
+            self.assertEqual(list(iter_lines(text.encode('utf-8'))), text.split("\n")[:-1])
+
+
+class TestFrontMatterAndTitle(unittest.TestCase):
+    def test_front_matter(self):
+        page = b"---\ndate: 2024\n\nTitle: Hi: there\n---\n# Post\n"
+        values, body_start = read_front_matter(page)
+        self.assertEqual(values, {"date": "2024", "title": "Hi: there"})
+        self.assertEqual(page[body_start:], b"# Post\n")
+
+    def test_no_front_matter(self):
+        self.assertEqual(read_front_matter(b"# Post\n---\n"), ({}, 0))
+
+    def test_rule_is_not_front_matter(self):
+        for page in [b"---\ndate: 2024\n# Post", b"---\nno separator\n---\n", b"---\n# Title\n\ntext"]:
+            self.assertEqual(read_front_matter(page), ({}, 0), page)
+
+    def test_title_after_offset(self):
+        page = b"---\ntitle: x\n---\n## Sub\n#  \n# Caf\xc3\xa9 \n# Second"
+        self.assertEqual(find_title(page, read_front_matter(page)[1]), "Café")
+
+    def test_missing_title(self):
+        with self.assertRaises(Exception):
+            find_title(b"no title\n#also not")
+
+
+class TestOpenSource(unittest.TestCase):
+    def test_small_files_are_read_and_large_files_mapped(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "page.md")
+            with open(path, 'wb') as f:
+                f.write(b"# Title\n\nBody\n")
+
+            with open_source(path) as view:
+                self.assertIsInstance(view, bytes)
+            with mock.patch.object(source, "MMAP_THRESHOLD", 1):
+                with open_source(path) as view:
+                    self.assertIsInstance(view, mmap.mmap)
+                    self.assertEqual(find_title(view), "Title")
+                    self.assertEqual(list(iter_lines(view)), ["# Title", "", "Body"])
+
+    def test_empty_file(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "empty.md")
+            open(path, 'wb').close()
+            with mock.patch.object(source, "MMAP_THRESHOLD", 0):
+                with open_source(path) as view:
+                    self.assertEqual(view, b"")
+
+
+if __name__ == "__main__":
+    unittest.main()
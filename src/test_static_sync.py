@@ -0,0 +1,108 @@
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+
+from manifest import Manifest
+from static_sync import copy_file, list_files, needs_copy, sync_static
+from testutil import ProjectTestCase, read_file, write_file
+
+
+class TestSyncStatic(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.static_dir = os.path.join(self.tmp.name, "static")
+        self.public_dir = os.path.join(self.tmp.name, "docs")
+        write_file(os.path.join(self.static_dir, "index.css"), "body {}")
+        write_file(os.path.join(self.static_dir, "images", "a.png"), "png")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def sync(self, static_dir, **kwargs):
+        with contextlib.redirect_stdout(io.StringIO()):
+            return sync_static(static_dir, self.public_dir, **kwargs)
+
+    def test_first_sync_copies_everything(self):
+        files, copied = self.sync(self.static_dir)
+        self.assertEqual(files, [os.path.join("images", "a.png"), "index.css"])
+        self.assertEqual(copied, files)
+        self.assertEqual(read_file(os.path.join(self.public_dir, "images", "a.png")), "png")
+
+    def test_unchanged_files_are_skipped(self):
+        self.sync(self.static_dir)
+        write_file(os.path.join(self.static_dir, "index.css"), "body { margin: 0 }")
+        _, copied = self.sync(self.static_dir)
+        self.assertEqual(copied, ["index.css"])
+        self.assertEqual(read_file(os.path.join(self.public_dir, "index.css")), "body { margin: 0 }")
+
+    def test_copy_keeps_mtime(self):
+        source = os.path.join(self.static_dir, "index.css")
+        os.utime(source, ns=(10**18, 10**18))
+        self.sync(self.static_dir)
+        self.assertEqual(os.stat(os.path.join(self.public_dir, "index.css")).st_mtime_ns, 10**18)
+
+    def test_checksum_mode_ignores_mtime(self):
+        self.sync(self.static_dir)
+        source = os.path.join(self.static_dir, "index.css")
+        dest = os.path.join(self.public_dir, "index.css")
+        os.utime(source, ns=(0, 0))
+        self.assertTrue(needs_copy(source, dest))
+        self.assertFalse(needs_copy(source, dest, checksum=True))
+
+    def test_link_mode_hardlinks(self):
+        self.sync(self.static_dir, link=True)
+        self.assertTrue(os.path.samefile(
+            os.path.join(self.static_dir, "index.css"), os.path.join(self.public_dir, "index.css")))
+
+    def test_copy_does_not_write_through_hardlink(self):
+        source = os.path.join(self.static_dir, "index.css")
+        dest = os.path.join(self.public_dir, "index.css")
+        self.sync(self.static_dir, link=True)
+        other = os.path.join(self.tmp.name, "other.css")
+        write_file(other, "replaced")
+        copy_file(other, dest)
+        self.assertEqual(read_file(source), "body {}")
+        self.assertEqual(read_file(dest), "replaced")
+
+    def test_missing_static_dir(self):
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            self.assertEqual(sync_static(os.path.join(self.tmp.name, "nope"), self.public_dir), ([], []))
+        self.assertIn("No static directory found", output.getvalue())
+
+
+class TestBuildStaticSync(ProjectTestCase):
+    FILES = {
+        "content/index.md": "# Home",
+        "static/index.css": "body {}",
+        "static/images/a.png": "png",
+    }
+
+    def test_full_build_does_not_wipe_unchanged_assets(self):
+        self.build()
+        output = os.path.join(self.public_dir, "images", "a.png")
+        inode = os.stat(output).st_ino
+        self.build()
+        self.assertEqual(os.stat(output).st_ino, inode)
+
+    def test_full_build_removes_unknown_outputs(self):
+        self.build()
+        write_file(os.path.join(self.public_dir, "old", "page.html"), "stale")
+        self.build()
+        self.assertEqual(list_files(self.public_dir), [os.path.join("images", "a.png"), "index.css", "index.html"])
+
+    def test_incremental_build_prunes_deleted_assets(self):
+        self.build()
+        write_file(os.path.join(self.public_dir, "keep.txt"), "not ours")
+        os.remove(os.path.join(self.project_dir, "static", "images", "a.png"))
+        self.build(incremental=True)
+
+        self.assertFalse(os.path.exists(os.path.join(self.public_dir, "images")))
+        self.assertTrue(os.path.exists(os.path.join(self.public_dir, "keep.txt")))
+        self.assertEqual(Manifest.load(self.manifest_path).static, ["index.css"])
+
+
+if __name__ == "__main__":
+    unittest.main()
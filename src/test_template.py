@@ -0,0 +1,142 @@
+import os
+import tempfile
+import unittest
+
+from htmlnode import LeafNode, ParentNode
+from main import generate_page, split_front_matter
+from profiling import PageTimer
+from markdown_to_html import markdown_to_html_node
+from source import read_front_matter
+from template import Template, load_template
+
+
+class TestTemplate(unittest.TestCase):
+    def test_parse_segments(self):
+        template = Template("<title>{{ Title }}</title><main>{{Content}}</main>")
+        self.assertEqual(template.literals, ["<title>", "</title><main>", "</main>"])
+        self.assertEqual(template.names, ["title", "content"])
+
+    def test_render_values(self):
+        template = Template("<title>{{ Title }}</title><p>{{ Date }} - {{ description }}</p>")
+        html = template.render({"title": "Home", "date": "2024-01-01", "description": "About"})
+        self.assertEqual(html, "<title>Home</title><p>2024-01-01 - About</p>")
+
+    def test_missing_value_is_left_in_place(self):
+        template = Template("<nav>{{ Nav }}</nav>{{ Title }}")
+        self.assertEqual(template.render({"title": "Home"}), "<nav>{{ Nav }}</nav>Home")
+
+    def test_node_values_are_streamed(self):
+        template = Template("<article>{{ Content }}</article>")
+        node = ParentNode("div", [LeafNode("b", "hi")])
+        self.assertEqual(
+            list(template.iter_render({"content": node})),
+            ["<article>", "<div>", "<b>hi</b>", "</div>", "</article>"],
+        )
+
+    def test_resolve_urls_in_literals(self):
+        template = Template('<link href="/index.css" /><img src="logo.png" />{{ Content }}')
+        resolved = template.resolve_urls(lambda url: "/site" + url if url.startswith("/") else url)
+        self.assertEqual(
+            resolved.render({"content": 'href="/kept"'}),
+            '<link href="/site/index.css" /><img src="logo.png" />href="/kept"',
+        )
+        self.assertEqual(template.literals[0], '<link href="/index.css" /><img src="logo.png" />')
+
+    def test_no_placeholders(self):
+        self.assertEqual(Template("plain").render({}), "plain")
+
+
+class TestLoadTemplate(unittest.TestCase):
+    def test_cached_until_file_changes(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "template.html")
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write("<b>{{ Title }}</b>")
+            first = load_template(path)
+            self.assertIs(load_template(path), first)
+
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write("<i>{{ Title }}</i>")
+            os.utime(path, ns=(0, 0))
+            self.assertEqual(load_template(path).render({"title": "x"}), "<i>x</i>")
+
+
+class TestFrontMatter(unittest.TestCase):
+    def test_split_front_matter(self):
+        values, body = split_front_matter("---\ndate: 2024-01-01\nDescription: a: b\n---\n# Title")
+        self.assertEqual(values, {"date": "2024-01-01", "description": "a: b"})
+        self.assertEqual(body, "# Title")
+
+    def test_no_front_matter(self):
+        self.assertEqual(split_front_matter("# Title\n---\n"), ({}, "# Title\n---\n"))
+
+    def test_unclosed_front_matter_is_body(self):
+        self.assertEqual(split_front_matter("---\ndate: 2024\n# Title"), ({}, "---\ndate: 2024\n# Title"))
+
+    def test_read_front_matter_returns_body_offset(self):
+        page = "---\r\ndate: 2024\r\n---  \r\n# Title\n".encode('utf-8')
+        values, body_start = read_front_matter(page)
+        self.assertEqual(values, {"date": "2024"})
+        self.assertEqual(page[body_start:], b"# Title\n")
+
+    def test_generate_page_streams_large_page(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            source = os.path.join(tmp, "page.md")
+            template_path = os.path.join(tmp, "template.html")
+            dest = os.path.join(tmp, "page.html")
+            markdown = "# Big\n\n" + "\n\n".join(f"Paragraph {i} with **bold**" for i in range(5000))
+            with open(source, 'w', encoding='utf-8') as f:
+                f.write(markdown)
+            with open(template_path, 'w', encoding='utf-8') as f:
+                f.write("<title>{{ Title }}</title>{{ Content }}")
+
+            generate_page(source, template_path, dest, "/")
+            with open(dest, encoding='utf-8') as f:
+                self.assertEqual(f.read(), "<title>Big</title>" + markdown_to_html_node(markdown).to_html())
+
+    def test_generate_page_fills_front_matter_placeholders(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            source = os.path.join(tmp, "page.md")
+            template_path = os.path.join(tmp, "template.html")
+            dest = os.path.join(tmp, "out", "page.html")
+            with open(source, 'w', encoding='utf-8') as f:
+                f.write("---\ndate: 2024-05-01\n---\n# Post\n\nBody")
+            with open(template_path, 'w', encoding='utf-8') as f:
+                f.write("<title>{{ Title }}</title><time>{{ Date }}</time>{{ Content }}")
+            generate_page(source, template_path, dest, "/")
+            with open(dest, encoding='utf-8') as f:
+                self.assertEqual(
+                    f.read(),
+                    "<title>Post</title><time>2024-05-01</time><div><h1>Post</h1><p>Body</p></div>",
+                )
+
+    def render(self, markdown, timer=None):
+        with tempfile.TemporaryDirectory() as tmp:
+            source = os.path.join(tmp, "page.md")
+            template_path = os.path.join(tmp, "template.html")
+            dest = os.path.join(tmp, "page.html")
+            with open(source, 'w', encoding='utf-8') as f:
+                f.write(markdown)
+            with open(template_path, 'w', encoding='utf-8') as f:
+                f.write("<title>{{ Title }}</title>{{ Content }}")
+            generate_page(source, template_path, dest, "/", timer)
+            with open(dest, encoding='utf-8') as f:
+                return f.read()
+
+    def test_page_opening_with_rule_renders_as_body(self):
+        markdown = "---\n# Title\n\ntext"
+        self.assertEqual(self.render(markdown), "<title>Title</title>" + markdown_to_html_node(markdown).to_html())
+
+    def test_front_matter_title_wins_over_h1(self):
+        self.assertEqual(self.render("---\ntitle: Custom\n---\n# Heading\n\nBody"),
+                         "<title>Custom</title><div><h1>Heading</h1><p>Body</p></div>")
+        self.assertEqual(self.render("---\ntitle: No h1\n---\nBody"), "<title>No h1</title><div><p>Body</p></div>")
+
+    def test_profiling_does_not_change_output(self):
+        for markdown in ["---\ntitle: Hi\n---\n", "---\ntitle: Hi\n---\n\n\n", "# One\n\n- a\n- b"]:
+            self.assertEqual(self.render(markdown, PageTimer()), self.render(markdown), markdown)
+        self.assertEqual(self.render("---\ntitle: Hi\n---\n"), "<title>Hi</title><div></div>")
+
+
+if __name__ == "__main__":
+    unittest.main()
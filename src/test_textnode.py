@@ -64,6 +64,22 @@ class TestTextNode(unittest.TestCase):
         self.assertEqual(html_node.value, None)
         self.assertEqual(html_node.props, {"src": "url.url", "alt": "alt text"})
 
+    def test_slots(self):
+        node = TextNode("text", "bold")
+        self.assertEqual(node.text_type, TextType.BOLD)
+        self.assertFalse(hasattr(node, "__dict__"))
+
+    def test_resolve_url(self):
+        def resolve(url):
+            return "/site" + url
+
+        link = TextNode("home", TextType.LINK, "/").text_node_to_html_node(resolve)
+        self.assertEqual(link.props, {"href": "/site/"})
+        image = TextNode("alt", TextType.IMAGE, "/a.png").text_node_to_html_node(resolve)
+        self.assertEqual(image.props, {"src": "/site/a.png", "alt": "alt"})
+        text = TextNode("/plain", TextType.NORMAL).text_node_to_html_node(resolve)
+        self.assertEqual(text.value, "/plain")
+
 
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
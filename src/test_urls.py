@@ -0,0 +1,36 @@
+import unittest
+
+from urls import BasepathResolver, get_resolver
+
+
+class TestBasepathResolver(unittest.TestCase):
+    def test_site_absolute_urls_get_basepath(self):
+        resolve = BasepathResolver("/site/")
+        self.assertEqual(resolve("/blog/tom"), "/site/blog/tom")
+        self.assertEqual(resolve("/"), "/site/")
+
+    def test_other_urls_unchanged(self):
+        resolve = BasepathResolver("/site/")
+        self.assertEqual(resolve("https://boot.dev"), "https://boot.dev")
+        self.assertEqual(resolve("//cdn.example.com/a.js"), "//cdn.example.com/a.js")
+        self.assertEqual(resolve("images/tom.png"), "images/tom.png")
+
+    def test_basepath_without_trailing_slash(self):
+        self.assertEqual(BasepathResolver("/site")("/contact"), "/site/contact")
+
+    def test_fingerprinted_assets(self):
+        resolve = BasepathResolver("/site/", (("/index.css", "/index.3fa9c1d2.css"),))
+        self.assertEqual(resolve("/index.css"), "/site/index.3fa9c1d2.css")
+        self.assertEqual(resolve("/contact"), "/site/contact")
+        self.assertEqual(resolve("index.css"), "index.css")
+        self.assertNotEqual(resolve.context, BasepathResolver("/site/").context)
+
+    def test_get_resolver(self):
+        self.assertIsNone(get_resolver("/"))
+        self.assertIs(get_resolver("/site/"), get_resolver("/site/"))
+        assets = (("/index.css", "/index.3fa9c1d2.css"),)
+        self.assertEqual(get_resolver("/", assets)("/index.css"), "/index.3fa9c1d2.css")
+
+
+if __name__ == "__main__":
+    unittest.main()
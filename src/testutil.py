@@ -0,0 +1,64 @@
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+
+from main import build
+
+TEMPLATE = "<html><title>{{ Title }}</title><body>{{ Content }}</body></html>"
+
+
+def write_file(path, text, mtime_ns=None):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(text)
+    if mtime_ns is not None:
+        os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def read_file(path):
+    with open(path, encoding='utf-8') as f:
+        return f.read()
+
+
+class ProjectTestCase(unittest.TestCase):
+    """A site project in a temporary directory, built into its docs/.
+
+    The project gets `TEMPLATE` as template.html plus `FILES`, a dict of
+    {path under the project with "/" separators: text}, for its content/
+    and static/ trees.
+    """
+
+    TEMPLATE = TEMPLATE
+    FILES = {}
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.project_dir = self.tmp.name
+        self.public_dir = self.path("docs")
+        self.manifest_path = self.path("cache", "manifest.json")
+        write_file(self.path("template.html"), self.TEMPLATE)
+        for relative_path, text in self.FILES.items():
+            write_file(self.path(*relative_path.split("/")), text)
+
+    def path(self, *parts):
+        return os.path.join(self.project_dir, *parts)
+
+    def output(self, *parts):
+        return os.path.join(self.public_dir, *parts)
+
+    def build(self, public_dir=None, incremental=False, **kwargs):
+        """Build the project into `public_dir`, docs/ by default, and return
+        what the build printed. Other output roots keep their manifest in
+        cache/<root name>.json unless `manifest_path` is given."""
+        if public_dir is None:
+            public_dir = self.public_dir
+            kwargs.setdefault("manifest_path", self.manifest_path)
+        else:
+            kwargs.setdefault("manifest_path", self.path("cache", os.path.basename(public_dir) + ".json"))
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            build(self.project_dir, public_dir, incremental=incremental, **kwargs)
+        return output.getvalue()
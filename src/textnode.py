@@ -9,12 +9,14 @@ class TextType(Enum):
     IMAGE = "image"
 
 class TextNode:
+    __slots__ = ("text", "text_type", "url")
+
     def __init__(self, text, text_type, url=None):
         self.text = text
-        self.text_type = TextType(text_type)
+        self.text_type = text_type if type(text_type) is TextType else TextType(text_type)
         self.url = url
 
-    def text_node_to_html_node(self):
+    def text_node_to_html_node(self, resolve_url=None):
         match self.text_type:
             case TextType.NORMAL:
                 return LeafNode(None, self.text)
@@ -25,9 +27,11 @@ class TextNode:
             case TextType.CODE:
                 return LeafNode("code", self.text)
             case TextType.LINK:
-                return LeafNode("a", self.text,  {"href": self.url})
+                url = resolve_url(self.url) if resolve_url else self.url
+                return LeafNode("a", self.text,  {"href": url})
             case TextType.IMAGE:
-                return LeafNode("img", "", {"src": self.url, "alt": self.text})               
+                url = resolve_url(self.url) if resolve_url else self.url
+                return LeafNode("img", "", {"src": url, "alt": self.text})               
             case _:
                 raise Exception("Failed text to html node conversion")
                 
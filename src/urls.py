@@ -0,0 +1,41 @@
+import functools, hashlib
+
+
+class BasepathResolver:
+    """Prefix site-absolute URLs ("/blog/tom") with the deployment basepath.
+
+    `assets` pairs site-absolute asset URLs with their fingerprinted URLs
+    ("/index.css", "/index.3fa9c1d2.css"); those are swapped in first.
+    External, relative and protocol-relative ("//cdn...") URLs are returned
+    unchanged.
+    """
+
+    def __init__(self, basepath, assets=()):
+        self.basepath = basepath if basepath.endswith("/") else basepath + "/"
+        self.assets = dict(assets)
+        # Everything besides a block's text that decides how it renders,
+        # for keying the block cache.
+        self.context = self.basepath
+        if assets:
+            self.context += " " + hashlib.blake2b(repr(assets).encode('utf-8'), digest_size=16).hexdigest()
+
+    def __call__(self, url):
+        if url.startswith("/") and not url.startswith("//"):
+            return self.basepath + self.assets.get(url, url)[1:]
+        return url
+
+    def __repr__(self):
+        return f"BasepathResolver({self.basepath!r}, {len(self.assets)} assets)"
+
+
+@functools.lru_cache(maxsize=None)
+def get_resolver(basepath, assets=()):
+    """Shared resolver for a basepath and tuple of fingerprinted asset URL
+    pairs, or None when URLs need no rewriting.
+
+    Resolvers are reused so caches keyed on them (compiled templates) hit
+    across pages.
+    """
+    if basepath == "/" and not assets:
+        return None
+    return BasepathResolver(basepath, assets)